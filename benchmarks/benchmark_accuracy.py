@@ -10,8 +10,9 @@ import os
 import sys
 import csv
 import numpy as np
+import pandas as pd
 import time
-from typing import List, Dict, Tuple
+from typing import Dict, Tuple
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -19,6 +20,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 from src.crypto.ckks_module import CKKSContext
 from src.analytics.statistics import homomorphic_mean, homomorphic_variance
 from src.analytics.accuracy_metrics import calculate_mse, calculate_rmse, calculate_accuracy_percentage
+from benchmarks.common import SIMD_SLOTS
 
 # Configuration
 DATA_DIR = os.path.join("data", "synthetic")
@@ -36,7 +38,7 @@ DATA_FILES = {
 
 BENCHMARK_FIELD = "heart_rate" # Example numeric field
 
-def load_data(limit: int) -> List[float]:
+def load_data(limit: int) -> np.ndarray:
     """Load data respecting the limit."""
     # Find best file
     if limit <= 1000:
@@ -54,22 +56,16 @@ def load_data(limit: int) -> List[float]:
         # Assuming standard files exist
         pass
 
-    values = []
     try:
-        with open(fpath, 'r', newline='') as f:
-            reader = csv.DictReader(f)
-            for i, row in enumerate(reader):
-                if i >= limit:
-                    break
-                try:
-                    values.append(float(row[BENCHMARK_FIELD]))
-                except (ValueError, KeyError):
-                    continue
+        # Parse only the benchmark column in pandas' C reader; unparseable
+        # cells are coerced to NaN and dropped (same as skipping the row)
+        df = pd.read_csv(fpath, usecols=[BENCHMARK_FIELD], nrows=limit)
     except FileNotFoundError:
         print(f"Warning: File {fpath} not found. Skipping {limit}.")
-        return []
+        return np.empty(0, dtype=np.float64)
         
-    return values
+    column = pd.to_numeric(df[BENCHMARK_FIELD], errors="coerce").dropna()
+    return column.to_numpy(dtype=np.float64)
 
 def run_accuracy_benchmark():
     print(f"Starting Accuracy Benchmark...")
@@ -81,6 +77,12 @@ def run_accuracy_benchmark():
     ctx.create_optimized_context() # Use optimized for accuracy check? Or Baseline? 
     # Usually we want to check the system we are proposing (Optimized Hybrid).
     # But CKKS parameters affect accuracy.
+    print(f"SEAL backend: {ctx.backend_info()}")
+    ctx.warn_if_hexl_missing()
+    
+    # Encryption worker processes are started once, before any timer, and
+    # reused for every dataset size; a single core encrypts in-process
+    pool = ctx.encrypt_pool() if (os.cpu_count() or 1) > 1 else None
     
     results = []
     
@@ -98,28 +100,42 @@ def run_accuracy_benchmark():
         print(f"  Plaintext Mean: {p_mean:.6f}")
         print(f"  Plaintext Var:  {p_var:.6f}")
         
-        # Encrypt using SIMD batching
-        print("  Encrypting with SIMD batching...")
-        SIMD_SLOTS = 8192
-        encrypted_chunks = []
+        # Encrypt X and X^2 in a single SIMD pass, accumulating both sums
+        print("  Encrypting X and X^2 with SIMD batching...")
+        arr = np.asarray(values, dtype=np.float64)
+        # Reusable zero-padded slot buffers; chunks are passed to TenSEAL as
+        # float64 arrays rather than 8192-element Python lists
+        buf = np.zeros(SIMD_SLOTS, dtype=np.float64)
+        sq = np.empty(SIMD_SLOTS, dtype=np.float64)
+        start = time.perf_counter_ns()
+        slot_vectors = []
         for i in range(0, count, SIMD_SLOTS):
-            chunk = values[i:i + SIMD_SLOTS]
-            chunk_size = len(chunk)
-            if chunk_size < SIMD_SLOTS:
-                chunk = chunk + [0.0] * (SIMD_SLOTS - chunk_size)
-            encrypted_chunks.append((ctx.encrypt_vector(chunk), chunk_size))
+            chunk = arr[i:i + SIMD_SLOTS]
+            buf[:chunk.size] = chunk
+            buf[chunk.size:] = 0.0
+            np.multiply(buf, buf, out=sq)
+            slot_vectors.append(buf.copy())
+            slot_vectors.append(sq.copy())
+        # Chunks are independent, so encrypt them in the process pool (one
+        # public-key context per worker); the adds below stay in this process
+        encrypted = ctx.process_encrypt(slot_vectors, executor=pool)
+        # In-place adds reuse the accumulator ciphertexts instead of
+        # allocating a fresh result per chunk
+        enc_sum, enc_squared_sum = encrypted[0], encrypted[1]
+        for enc, enc_sq in zip(encrypted[2::2], encrypted[3::2]):
+            enc_sum += enc
+            enc_squared_sum += enc_sq
+        dur = (time.perf_counter_ns() - start) / 1e9
+        print(f"     (took {dur:.6f}s)")
         
         # 1. Benchmark Mean using SIMD approach
         print("  Computing Encrypted Mean (SIMD)...")
-        # Sum all encrypted chunks
-        enc_sum = encrypted_chunks[0][0]
-        for enc, _ in encrypted_chunks[1:]:
-            enc_sum = enc_sum + enc
         
         # Decrypt and compute mean
         dec_vec = ctx.decrypt_vector(enc_sum)
         # Sum only valid values (exclude padding)
-        total = sum(dec_vec[:min(count, SIMD_SLOTS)]) if count <= SIMD_SLOTS else sum(dec_vec[:SIMD_SLOTS])
+        valid = min(count, SIMD_SLOTS)
+        total = float(np.asarray(dec_vec, dtype=np.float64)[:valid].sum())
         dec_mean = total / count
         
         mse_mean = calculate_mse([p_mean], [dec_mean])
@@ -145,30 +161,13 @@ def run_accuracy_benchmark():
         # Variance = E(X^2) - E(X)^2
         # We already have the mean (dec_mean), now compute E(X^2)
         
-        # Create new encrypted chunks for X^2
-        start = time.time()
-        squared_chunks = []
-        for i in range(0, count, SIMD_SLOTS):
-            chunk = values[i:i + SIMD_SLOTS]
-            squared_chunk = [v * v for v in chunk]
-            if len(squared_chunk) < SIMD_SLOTS:
-                squared_chunk = squared_chunk + [0.0] * (SIMD_SLOTS - len(squared_chunk))
-            squared_chunks.append(ctx.encrypt_vector(squared_chunk))
-        
-        # Sum squared encrypted chunks
-        enc_squared_sum = squared_chunks[0]
-        for enc in squared_chunks[1:]:
-            enc_squared_sum = enc_squared_sum + enc
-        
         # Decrypt and compute E(X^2)
         dec_squared_vec = ctx.decrypt_vector(enc_squared_sum)
-        total_squared = sum(dec_squared_vec[:min(count, SIMD_SLOTS)]) if count <= SIMD_SLOTS else sum(dec_squared_vec[:SIMD_SLOTS])
+        total_squared = float(np.asarray(dec_squared_vec, dtype=np.float64)[:valid].sum())
         mean_of_squares = total_squared / count
         
         # Variance = E(X^2) - E(X)^2
         dec_var = mean_of_squares - (dec_mean * dec_mean)
-        dur = time.time() - start
-        print(f"     (took {dur:.2f}s)")
         
         mse_var = calculate_mse([p_var], [dec_var])
         rmse_var = calculate_rmse([p_var], [dec_var])
@@ -188,14 +187,16 @@ def run_accuracy_benchmark():
             "accuracy_pct": acc_var
         })
 
+    if pool is not None:
+        pool.shutdown()
+
     # Save results
     os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
-    with open(OUTPUT_FILE, 'w', newline='') as f:
+    with open(OUTPUT_FILE, 'w', newline='', buffering=1 << 20) as f:
         fieldnames = ["operation", "record_count", "plaintext_result", "encrypted_result", "decrypted_result", "mse", "rmse", "accuracy_pct"]
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
-        for r in results:
-            writer.writerow(r)
+        writer.writerows(results)
             
     print(f"\nSaved results to {OUTPUT_FILE}")
 
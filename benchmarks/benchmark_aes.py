@@ -4,39 +4,89 @@ import sys
 import time
 from typing import List, Tuple
 
+from Crypto.Cipher import AES
+
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from src.crypto.aes_module import AESCipher
+from benchmarks.common import save_results_json
+
+
+def aes_backend() -> str:
+    # PyCryptodome picks AES-NI for the block cipher and PCLMULQDQ for GHASH
+    # at import time when the CPU supports them
+    try:
+        from Crypto.Util import _cpu_features
+    except ImportError:
+        return "unknown"
+    aesni = getattr(AES, "_raw_aesni_lib", None) is not None
+    clmul = bool(_cpu_features.have_clmul())
+    return f"aesni={'yes' if aesni else 'no'} clmul={'yes' if clmul else 'no'}"
 
 
-def run_benchmark(record_counts: List[int], plaintext_size: int = 128) -> List[Tuple[int, float, float]]:
+AESResult = Tuple[int, float, float, float, float, float]
+
+
+def run_benchmark(record_counts: List[int], plaintext_size: int = 128) -> List[AESResult]:
     key = AESCipher.generate_key()
-    results: List[Tuple[int, float, float]] = []
+    results: List[AESResult] = []
+    # Generate the largest plaintext set once and slice it for smaller counts
+    all_plaintexts = [os.urandom(plaintext_size) for _ in range(max(record_counts, default=0))]
 
     for count in record_counts:
-        plaintexts = [os.urandom(plaintext_size) for _ in range(count)]
+        plaintexts = all_plaintexts[:count]
         start = time.perf_counter()
         for pt in plaintexts:
             AESCipher.encrypt(pt, key)
         elapsed = time.perf_counter() - start
         throughput = count / elapsed if elapsed > 0 else 0.0
-        results.append((count, elapsed, throughput))
+
+        # Bulk: one GCM message over all records, so the per-call Python
+        # overhead is paid once and the AES-NI/GHASH pipeline dominates.
+        # Throughput is the raw cipher only; the AESCipher wrapper (base64
+        # and payload building) is timed separately on the same message
+        bulk = b"".join(plaintexts)
+        start = time.perf_counter()
+        AES.new(key, AES.MODE_GCM).encrypt_and_digest(bulk)
+        bulk_elapsed = time.perf_counter() - start
+        bulk_bytes_per_sec = len(bulk) / bulk_elapsed if bulk_elapsed > 0 else 0.0
+
+        start = time.perf_counter()
+        AESCipher.encrypt(bulk, key)
+        wrapper_elapsed = time.perf_counter() - start
+
+        results.append((count, elapsed, throughput, bulk_elapsed, bulk_bytes_per_sec, wrapper_elapsed))
 
     return results
 
 
-def save_results_csv(results: List[Tuple[int, float, float]], path: str, plaintext_size: int) -> None:
+def save_results_csv(results: List[AESResult], path: str, plaintext_size: int) -> None:
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", newline="") as f:
+    with open(path, "w", newline="", buffering=1 << 20) as f:
         w = csv.writer(f)
-        w.writerow(["records", "plaintext_size_bytes", "total_seconds", "throughput_ops_per_sec"])
-        for records, seconds, tput in results:
-            w.writerow([records, plaintext_size, f"{seconds:.6f}", f"{tput:.2f}"])
+        w.writerow(["records", "plaintext_size_bytes", "total_seconds", "throughput_ops_per_sec",
+                    "bulk_seconds", "bulk_throughput_bytes_per_sec", "bulk_wrapper_seconds"])
+        for records, seconds, tput, bulk_seconds, bulk_tput, wrapper_seconds in results:
+            w.writerow([records, plaintext_size, f"{seconds:.6f}", f"{tput:.2f}",
+                        f"{bulk_seconds:.6f}", f"{bulk_tput:.2f}", f"{wrapper_seconds:.6f}"])
+
+    # Same numbers as JSON for programmatic consumers
+    summary = [
+        {"records": records, "plaintext_size_bytes": plaintext_size, "total_seconds": seconds,
+         "throughput_ops_per_sec": tput, "throughput_bytes_per_sec": tput * plaintext_size,
+         "bulk_seconds": bulk_seconds, "bulk_throughput_bytes_per_sec": bulk_tput,
+         "bulk_wrapper_seconds": wrapper_seconds}
+        for records, seconds, tput, bulk_seconds, bulk_tput, wrapper_seconds in results
+    ]
+    save_results_json(path, summary)
 
 
 if __name__ == "__main__":
     counts = [1_000, 10_000, 100_000]
     size = 128
+    print(f"AES-256-GCM backend: {aes_backend()}")
     res = run_benchmark(counts, plaintext_size=size)
     save_results_csv(res, os.path.join("benchmarks", "aes_results.csv"), plaintext_size=size)
-    for records, seconds, tput in res:
-        print(f"records={records} size={size}B time={seconds:.4f}s throughput={tput:.2f} ops/s")
+    for records, seconds, tput, bulk_seconds, bulk_tput, wrapper_seconds in res:
+        print(f"records={records} size={size}B time={seconds:.4f}s throughput={tput:.2f} ops/s "
+              f"bulk={bulk_seconds:.4f}s ({bulk_tput / 1e6:.1f} MB/s) "
+              f"wrapper={wrapper_seconds:.4f}s")
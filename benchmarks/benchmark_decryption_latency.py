@@ -19,6 +19,11 @@ import os
 import sys
 import csv
 import time
+import timeit
+import argparse
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # headless: skip GUI backend probing
 import matplotlib.pyplot as plt
 import pandas as pd
 from typing import List
@@ -28,13 +33,33 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 from src.crypto.aes_module import AESCipher
 from src.crypto.ckks_module import CKKSContext
 from src.analytics.statistics import homomorphic_mean
+from benchmarks.common import SIMD_SLOTS, pii_fixture, shared_ctx, simd_chunks
 
 # Configuration
 OUTPUT_DIR = "benchmarks"
 CHARTS_DIR = os.path.join(OUTPUT_DIR, "charts")
+os.makedirs(CHARTS_DIR, exist_ok=True)  # also creates OUTPUT_DIR
+RESULT_FIELDS = ("num_records", "aes_total_sec", "aes_per_record_ms", "aes_throughput",
+                 "ckks_total_sec", "ckks_per_result_ms", "ckks_throughput")
 
 
-def benchmark_aes_decryption(num_records: int) -> dict:
+def _time_call(fn, quick: bool = False) -> float:
+    """
+    Seconds taken by one call of fn.
+    
+    By default timeit's autorange repeats the call until the loop takes at
+    least 0.2 s and returns the per-call average, which smooths out clock
+    jitter and GC pauses at small record counts. quick times a single call.
+    """
+    if quick:
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+    loops, total = timeit.Timer(fn).autorange()
+    return total / loops
+
+
+def benchmark_aes_decryption(num_records: int, quick: bool = False) -> dict:
     """
     Benchmark AES decryption latency.
     
@@ -47,14 +72,11 @@ def benchmark_aes_decryption(num_records: int) -> dict:
     
     # Prepare encrypted data
     key = AESCipher.generate_key()
-    pii_data = [f"Patient_{i}_John_Doe_123_Main_St" for i in range(num_records)]
-    encrypted_data = [AESCipher.encrypt(data.encode('utf-8'), key) for data in pii_data]
+    pii_data = pii_fixture(b"Patient_%d_John_Doe_123_Main_St", num_records)
+    encrypted_data = AESCipher.encrypt_many(pii_data, key)
     
     # Benchmark decryption
-    start = time.perf_counter()
-    for enc in encrypted_data:
-        _ = AESCipher.decrypt(enc, key)
-    elapsed = time.perf_counter() - start
+    elapsed = _time_call(lambda: AESCipher.decrypt_many(encrypted_data, key), quick)
     
     per_record_ms = (elapsed / num_records) * 1000
     throughput = num_records / elapsed if elapsed > 0 else 0
@@ -68,7 +90,7 @@ def benchmark_aes_decryption(num_records: int) -> dict:
     }
 
 
-def benchmark_ckks_decryption(num_records: int) -> dict:
+def benchmark_ckks_decryption(num_records: int, quick: bool = False) -> dict:
     """
     Benchmark CKKS decryption latency using SIMD batching.
     
@@ -82,29 +104,17 @@ def benchmark_ckks_decryption(num_records: int) -> dict:
     """
     print(f"  CKKS decryption for {num_records} results (SIMD batched)...")
     
-    SIMD_SLOTS = 8192
-    
     # Prepare encrypted data using SIMD batching
-    ctx = CKKSContext()
-    ctx.create_optimized_context()
+    ctx = shared_ctx()
     
     # Pack values into SIMD slots
-    all_values = [98.6 + i * 0.1 for i in range(num_records)]
-    encrypted_chunks = []
-    
-    for i in range(0, num_records, SIMD_SLOTS):
-        chunk = all_values[i:i + SIMD_SLOTS]
-        if len(chunk) < SIMD_SLOTS:
-            chunk = chunk + [0.0] * (SIMD_SLOTS - len(chunk))
-        encrypted_chunks.append(ctx.encrypt_vector(chunk))
+    all_values = np.arange(num_records, dtype=np.float64) * 0.1 + 98.6
+    encrypted_chunks = ctx.parallel_encrypt(simd_chunks(all_values, SIMD_SLOTS))
     
     num_ciphertexts = len(encrypted_chunks)
     
     # Benchmark decryption of SIMD-packed ciphertexts
-    start = time.perf_counter()
-    for enc in encrypted_chunks:
-        _ = ctx.decrypt_vector(enc)
-    elapsed = time.perf_counter() - start
+    elapsed = _time_call(lambda: [ctx.decrypt_vector(enc) for enc in encrypted_chunks], quick)
     
     # Calculate metrics per original record (not per ciphertext)
     per_result_ms = (elapsed / num_records) * 1000
@@ -133,52 +143,47 @@ def benchmark_end_to_end_latency(num_records: int) -> dict:
     """
     print(f"  End-to-end latency simulation ({num_records} records, SIMD batched)...")
     
-    SIMD_SLOTS = 8192
-    
     # Setup
     aes_key = AESCipher.generate_key()
-    ctx = CKKSContext()
-    ctx.create_optimized_context()
+    ctx = shared_ctx()
     
     # Generate data
-    all_values = [98.6 + i * 0.1 for i in range(num_records)]
+    all_values = np.arange(num_records, dtype=np.float64) * 0.1 + 98.6
+    # Plaintext reference, computed before any timer starts
+    expected_mean = float(np.mean(all_values))
     
     # 1. Encryption time using SIMD batching
     encrypt_start = time.perf_counter()
-    encrypted_chunks = []
-    for i in range(0, num_records, SIMD_SLOTS):
-        chunk = all_values[i:i + SIMD_SLOTS]
-        chunk_size = len(chunk)
-        if chunk_size < SIMD_SLOTS:
-            chunk = chunk + [0.0] * (SIMD_SLOTS - chunk_size)
-        encrypted_chunks.append((ctx.encrypt_vector(chunk), chunk_size))
+    # Chunks are independent, so encrypt them across worker threads
+    encrypted_chunks = ctx.parallel_encrypt(simd_chunks(all_values, SIMD_SLOTS))
     encrypt_time = time.perf_counter() - encrypt_start
     
-    # 2. Homomorphic computation time (sum all chunks, then compute mean)
+    # 2. Homomorphic computation time (sum all chunks; result stays encrypted)
     compute_start = time.perf_counter()
-    total_sum = None
-    for enc, chunk_size in encrypted_chunks:
-        if total_sum is None:
-            total_sum = enc
-        else:
-            total_sum = total_sum + enc
-    
-    # Decrypt and compute mean
-    dec = ctx.decrypt_vector(total_sum)
-    total = sum(dec[:min(num_records, SIMD_SLOTS)]) if num_records <= SIMD_SLOTS else sum(dec[:SIMD_SLOTS])
-    mean_val = total / num_records
+    # Sequential in-place adds into one accumulator
+    total_sum = CKKSContext.sum_encrypted(encrypted_chunks)
     compute_time = time.perf_counter() - compute_start
     
-    # 3. Decryption time (already included in compute for SIMD approach)
+    # 3. Decryption time: the single decrypt of the aggregated ciphertext,
+    # followed by the client-side slot reduction to the mean
     decrypt_start = time.perf_counter()
-    # Final result is already decrypted in compute step, simulate single decrypt
-    _ = ctx.decrypt_vector(total_sum)
+    dec = ctx.decrypt_vector(total_sum)
+    total = float(np.sum(np.asarray(dec[:min(num_records, SIMD_SLOTS)], dtype=np.float64)))
     decrypt_time = time.perf_counter() - decrypt_start
     
     total_time = encrypt_time + compute_time + decrypt_time
     
+    # Correctness check against the plaintext reference, outside all timers
+    mean_val = total / num_records
+    abs_error = abs(mean_val - expected_mean)
+    if abs_error >= 1e-3:
+        raise RuntimeError(
+            f"CKKS mean {mean_val} differs from plaintext mean {expected_mean} "
+            f"(abs error {abs_error:.2e}, tolerance 1e-3)"
+        )
+    
     print(f"    Encrypt: {encrypt_time:.4f}s | Compute: {compute_time:.4f}s | Decrypt: {decrypt_time:.4f}s")
-    print(f"    Total: {total_time:.4f}s | Mean: {mean_val:.4f}")
+    print(f"    Total: {total_time:.4f}s | Mean: {mean_val:.4f} (abs error {abs_error:.2e})")
     
     return {
         "encrypt_seconds": encrypt_time,
@@ -188,37 +193,48 @@ def benchmark_end_to_end_latency(num_records: int) -> dict:
     }
 
 
-def run_decryption_benchmarks():
-    """Run all decryption latency benchmarks"""
+def run_decryption_benchmarks(quick: bool = False):
+    """Run all decryption latency benchmarks (quick: one-shot timings for CI)"""
     print("\n" + "=" * 70)
     print("  Decryption Latency Benchmark")
     print("=" * 70)
     
     dataset_sizes = [1000, 5000]  # Reduced for faster testing
-    results = []
+    results = []  # kept only for the charts
     
-    for size in dataset_sizes:
-        print(f"\n📊 Dataset: {size} records")
-        
-        aes_metrics = benchmark_aes_decryption(size)
-        ckks_metrics = benchmark_ckks_decryption(size)
+    # Stream each size's row to the CSV as soon as it is measured
+    results_path = os.path.join(OUTPUT_DIR, "decryption_latency_results.csv")
+    with open(results_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(RESULT_FIELDS)
         
-        results.append({
-            "num_records": size,
-            "aes_total_sec": aes_metrics["total_seconds"],
-            "aes_per_record_ms": aes_metrics["per_record_ms"],
-            "aes_throughput": aes_metrics["throughput_rec_per_sec"],
-            "ckks_total_sec": ckks_metrics["total_seconds"],
-            "ckks_per_result_ms": ckks_metrics["per_result_ms"],
-            "ckks_throughput": ckks_metrics["throughput_res_per_sec"]
-        })
+        for size in dataset_sizes:
+            print(f"\n📊 Dataset: {size} records")
+            
+            aes_metrics = benchmark_aes_decryption(size, quick)
+            ckks_metrics = benchmark_ckks_decryption(size, quick)
+            
+            row = {
+                "num_records": size,
+                "aes_total_sec": aes_metrics["total_seconds"],
+                "aes_per_record_ms": aes_metrics["per_record_ms"],
+                "aes_throughput": aes_metrics["throughput_rec_per_sec"],
+                "ckks_total_sec": ckks_metrics["total_seconds"],
+                "ckks_per_result_ms": ckks_metrics["per_result_ms"],
+                "ckks_throughput": ckks_metrics["throughput_res_per_sec"]
+            }
+            writer.writerow([row[k] for k in RESULT_FIELDS])
+            f.flush()
+            results.append(row)
+    
+    print(f"\n✅ Results saved to: {results_path}")
     
     # End-to-end latency for middle dataset
     print(f"\n📊 End-to-End Latency Analysis")
     e2e_metrics = benchmark_end_to_end_latency(dataset_sizes[1])  # Use 10K
     
     # Save results
-    save_results(results, e2e_metrics)
+    save_results(e2e_metrics)
     
     # Generate charts
     generate_latency_charts(results, e2e_metrics)
@@ -226,20 +242,8 @@ def run_decryption_benchmarks():
     return results
 
 
-def save_results(results, e2e_metrics):
-    """Save decryption latency results to CSV"""
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    
-    # Main decryption results
-    results_path = os.path.join(OUTPUT_DIR, "decryption_latency_results.csv")
-    with open(results_path, 'w', newline='') as f:
-        if results:
-            writer = csv.DictWriter(f, fieldnames=results[0].keys())
-            writer.writeheader()
-            writer.writerows(results)
-    
-    print(f"\n✅ Results saved to: {results_path}")
-    
+def save_results(e2e_metrics):
+    """Save end-to-end latency results to CSV (per-size rows are streamed by the runner)"""
     # End-to-end latency
     e2e_path = os.path.join(OUTPUT_DIR, "end_to_end_latency_results.csv")
     with open(e2e_path, 'w', newline='') as f:
@@ -257,7 +261,7 @@ def generate_latency_charts(results, e2e_metrics):
     df = pd.DataFrame(results)
     
     # Create figure with 2 subplots
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6), layout="constrained")
     
     # Chart 1: Per-Record/Result Latency
     x = range(len(df))
@@ -296,19 +300,22 @@ def generate_latency_charts(results, e2e_metrics):
              ha='center', fontsize=11, fontweight='bold',
              bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
     
-    plt.tight_layout()
     
     # Save chart
-    os.makedirs(CHARTS_DIR, exist_ok=True)
     chart_path = os.path.join(CHARTS_DIR, "decryption_latency.png")
-    plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+    fig.savefig(chart_path, dpi=150, bbox_inches='tight')
     print(f"✅ Chart saved: {chart_path}")
-    plt.close()
+    plt.close(fig)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Decryption latency benchmark")
+    parser.add_argument("--quick", action="store_true",
+                        help="time each decryption pass once instead of using timeit autorange")
+    args = parser.parse_args()
+    
     try:
-        results = run_decryption_benchmarks()
+        results = run_decryption_benchmarks(quick=args.quick)
         
         print("\n" + "=" * 70)
         print("  Decryption Latency Summary")
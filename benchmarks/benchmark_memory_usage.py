@@ -21,11 +21,13 @@ import os
 import sys
 import csv
 import time
+import tracemalloc
+import numpy as np
 import psutil
+import matplotlib
+matplotlib.use("Agg")  # headless: skip GUI backend probing
 import matplotlib.pyplot as plt
-import seaborn as sns
 import pandas as pd
-from memory_profiler import memory_usage
 from typing import List, Tuple
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -33,10 +35,14 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 from src.crypto.aes_module import AESCipher
 from src.crypto.ckks_module import CKKSContext
 from src.analytics.statistics import homomorphic_mean
+from benchmarks.common import SIMD_SLOTS, pii_fixture, shared_ctx, simd_chunks
 
 # Configuration
 OUTPUT_DIR = "benchmarks"
 CHARTS_DIR = os.path.join(OUTPUT_DIR, "charts")
+os.makedirs(CHARTS_DIR, exist_ok=True)  # also creates OUTPUT_DIR
+RESULT_FIELDS = ("num_records", "aes_encrypt_mb", "ckks_baseline_encrypt_mb", "ckks_optimized_encrypt_mb",
+                 "computation_mb", "aes_decrypt_mb", "ckks_decrypt_mb")
 DATA_DIR = os.path.join("data", "synthetic")
 
 
@@ -46,6 +52,28 @@ def get_current_memory_mb() -> float:
     return process.memory_info().rss / 1024 / 1024
 
 
+def _peak_mb(task) -> float:
+    """
+    Run task and return the peak memory it added, in MB, without a polling sampler.
+    
+    tracemalloc records the exact peak of Python/NumPy allocations during the
+    call. TenSEAL's native (C++) allocations are invisible to it, so the RSS
+    growth across the call (SEAL's memory pool keeps what it allocated) is
+    used instead when that is larger. Tasks return nothing, so every task is
+    measured with the same retention.
+    """
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    tracemalloc.start()
+    try:
+        task()
+        _, traced_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    rss_growth = process.memory_info().rss - rss_before
+    return max(traced_peak, rss_growth) / 1024 / 1024
+
+
 def benchmark_encryption_memory(num_records: int) -> dict:
     """
     Benchmark memory usage during encryption.
@@ -58,46 +86,38 @@ def benchmark_encryption_memory(num_records: int) -> dict:
     print(f"  Benchmarking encryption memory for {num_records} records...")
     
     # Generate test data
-    pii_data = [f"Patient_{i}_John_Doe" for i in range(num_records)]
-    numeric_data = [[98.6 + i * 0.1, 120.0 + i * 0.5, 80.0 + i * 0.3] for i in range(num_records)]
+    pii_data = pii_fixture(b"Patient_%d_John_Doe", num_records)
+    numeric_data = np.arange(num_records, dtype=np.float64)[:, None] * [0.1, 0.5, 0.3] + [98.6, 120.0, 80.0]
     
     # AES Encryption Memory
     mem_before = get_current_memory_mb()
     
     def aes_encrypt_task():
         key = AESCipher.generate_key()
-        for data in pii_data:
-            AESCipher.encrypt(data.encode('utf-8'), key)
+        AESCipher.encrypt_many(pii_data, key)
     
-    aes_mem_usage = memory_usage((aes_encrypt_task,), interval=0.01, max_usage=True)
-    aes_peak = aes_mem_usage if isinstance(aes_mem_usage, (int, float)) else max(aes_mem_usage)
+    aes_peak = _peak_mb(aes_encrypt_task)
+    
+    # CKKS Baseline Encryption Memory (context built before measuring, so
+    # only the encryption loop is counted; keygen is measured separately)
+    baseline_ctx = shared_ctx(optimized=False)
     
-    # CKKS Baseline Encryption Memory
     def ckks_baseline_encrypt_task():
-        ctx = CKKSContext()
-        ctx.create_context()
         for data in numeric_data:
-            ctx.encrypt_vector(data)
+            baseline_ctx.encrypt_vector(data)
     
-    ckks_baseline_mem_usage = memory_usage((ckks_baseline_encrypt_task,), interval=0.01, max_usage=True)
-    ckks_baseline_peak = ckks_baseline_mem_usage if isinstance(ckks_baseline_mem_usage, (int, float)) else max(ckks_baseline_mem_usage)
+    ckks_baseline_peak = _peak_mb(ckks_baseline_encrypt_task)
     
     # CKKS Optimized Encryption Memory (SIMD Batching)
-    SIMD_SLOTS = 8192
-    all_values = [v for sublist in numeric_data for v in sublist]  # Flatten
+    all_values = numeric_data.ravel()  # Flatten (row-major, same order as before)
+    
+    optimized_ctx = shared_ctx()
     
     def ckks_optimized_encrypt_task():
-        ctx = CKKSContext()
-        ctx.create_optimized_context()
         # Pack values into SIMD slots - each ciphertext holds up to 8192 values
-        for i in range(0, len(all_values), SIMD_SLOTS):
-            chunk = all_values[i:i + SIMD_SLOTS]
-            if len(chunk) < SIMD_SLOTS:
-                chunk = chunk + [0.0] * (SIMD_SLOTS - len(chunk))
-            ctx.encrypt_vector(chunk)
+        optimized_ctx.parallel_encrypt(simd_chunks(all_values, SIMD_SLOTS))
     
-    ckks_optimized_mem_usage = memory_usage((ckks_optimized_encrypt_task,), interval=0.01, max_usage=True)
-    ckks_optimized_peak = ckks_optimized_mem_usage if isinstance(ckks_optimized_mem_usage, (int, float)) else max(ckks_optimized_mem_usage)
+    ckks_optimized_peak = _peak_mb(ckks_optimized_encrypt_task)
     
     print(f"    AES: {aes_peak:.2f} MB")
     print(f"    CKKS Baseline: {ckks_baseline_peak:.2f} MB")
@@ -114,34 +134,24 @@ def benchmark_computation_memory(num_records: int) -> float:
     """Benchmark memory usage during homomorphic mean computation using SIMD batching"""
     print(f"  Benchmarking computation memory for {num_records} records (SIMD)...")
     
-    SIMD_SLOTS = 8192
-    
-    # Prepare encrypted data using SIMD batching
-    ctx = CKKSContext()
-    ctx.create_optimized_context()
+    # Prepare encrypted data using SIMD batching (outside the measured task,
+    # so only the homomorphic operations are counted)
+    ctx = shared_ctx()
     
-    all_values = [98.6 + i * 0.1 for i in range(num_records)]
-    encrypted_chunks = []
-    for i in range(0, num_records, SIMD_SLOTS):
-        chunk = all_values[i:i + SIMD_SLOTS]
-        if len(chunk) < SIMD_SLOTS:
-            chunk = chunk + [0.0] * (SIMD_SLOTS - len(chunk))
-        encrypted_chunks.append(ctx.encrypt_vector(chunk))
+    all_values = np.arange(num_records, dtype=np.float64) * 0.1 + 98.6
+    encrypted_chunks = ctx.parallel_encrypt(simd_chunks(all_values, SIMD_SLOTS))
     
     mem_before = get_current_memory_mb()
     
     def computation_task():
         # Sum all encrypted chunks
-        total_sum = encrypted_chunks[0]
-        for enc in encrypted_chunks[1:]:
-            total_sum = total_sum + enc
+        total_sum = ctx.sum_encrypted(encrypted_chunks)
         # Decrypt and compute mean
         dec = ctx.decrypt_vector(total_sum)
-        total = sum(dec[:min(num_records, SIMD_SLOTS)])
+        total = float(np.sum(np.asarray(dec[:min(num_records, SIMD_SLOTS)], dtype=np.float64)))
         mean_val = total / num_records
     
-    comp_mem_usage = memory_usage((computation_task,), interval=0.01, max_usage=True)
-    peak_mb = comp_mem_usage if isinstance(comp_mem_usage, (int, float)) else max(comp_mem_usage)
+    peak_mb = _peak_mb(computation_task)
     
     print(f"    Computation: {peak_mb:.2f} MB")
     
@@ -156,27 +166,24 @@ def benchmark_key_generation_memory() -> dict:
     
     # AES Key Generation
     def aes_keygen_task():
-        for _ in range(100):  # Generate multiple keys for better measurement
-            AESCipher.generate_key()
+        # Generate multiple keys for better measurement, in one CSPRNG draw
+        AESCipher.generate_keys(100)
     
-    aes_mem_usage = memory_usage((aes_keygen_task,), interval=0.01, max_usage=True)
-    aes_peak = aes_mem_usage if isinstance(aes_mem_usage, (int, float)) else max(aes_mem_usage)
+    aes_peak = _peak_mb(aes_keygen_task)
     
     # CKKS Baseline Key Generation
     def ckks_baseline_keygen_task():
         ctx = CKKSContext()
         ctx.create_context()
     
-    ckks_baseline_mem_usage = memory_usage((ckks_baseline_keygen_task,), interval=0.01, max_usage=True)
-    ckks_baseline_peak = ckks_baseline_mem_usage if isinstance(ckks_baseline_mem_usage, (int, float)) else max(ckks_baseline_mem_usage)
+    ckks_baseline_peak = _peak_mb(ckks_baseline_keygen_task)
     
     # CKKS Optimized Key Generation
     def ckks_optimized_keygen_task():
         ctx = CKKSContext()
         ctx.create_optimized_context()
     
-    ckks_optimized_mem_usage = memory_usage((ckks_optimized_keygen_task,), interval=0.01, max_usage=True)
-    ckks_optimized_peak = ckks_optimized_mem_usage if isinstance(ckks_optimized_mem_usage, (int, float)) else max(ckks_optimized_mem_usage)
+    ckks_optimized_peak = _peak_mb(ckks_optimized_keygen_task)
     
     print(f"    AES: {aes_peak:.2f} MB")
     print(f"    CKKS Baseline: {ckks_baseline_peak:.2f} MB")
@@ -193,41 +200,30 @@ def benchmark_decryption_memory(num_records: int) -> dict:
     """Benchmark memory usage during decryption using SIMD batching for CKKS"""
     print(f"  Benchmarking decryption memory for {num_records} records (SIMD)...")
     
-    SIMD_SLOTS = 8192
-    
     # Prepare AES encrypted data
     key = AESCipher.generate_key()
-    pii_data = [f"Patient_{i}" for i in range(num_records)]
-    aes_encrypted = [AESCipher.encrypt(data.encode('utf-8'), key) for data in pii_data]
+    pii_data = pii_fixture(b"Patient_%d", num_records)
+    aes_encrypted = AESCipher.encrypt_many(pii_data, key)
     
     # Prepare CKKS encrypted data using SIMD batching
-    ctx = CKKSContext()
-    ctx.create_optimized_context()
-    all_values = [98.6 + i * 0.1 for i in range(num_records)]
-    ckks_encrypted = []
-    for i in range(0, num_records, SIMD_SLOTS):
-        chunk = all_values[i:i + SIMD_SLOTS]
-        if len(chunk) < SIMD_SLOTS:
-            chunk = chunk + [0.0] * (SIMD_SLOTS - len(chunk))
-        ckks_encrypted.append(ctx.encrypt_vector(chunk))
+    ctx = shared_ctx()
+    all_values = np.arange(num_records, dtype=np.float64) * 0.1 + 98.6
+    ckks_encrypted = ctx.parallel_encrypt(simd_chunks(all_values, SIMD_SLOTS))
     
     mem_before = get_current_memory_mb()
     
     # AES Decryption
     def aes_decrypt_task():
-        for enc in aes_encrypted:
-            AESCipher.decrypt(enc, key)
+        AESCipher.decrypt_many(aes_encrypted, key)
     
-    aes_mem_usage = memory_usage((aes_decrypt_task,), interval=0.01, max_usage=True)
-    aes_peak = aes_mem_usage if isinstance(aes_mem_usage, (int, float)) else max(aes_mem_usage)
+    aes_peak = _peak_mb(aes_decrypt_task)
     
     # CKKS Decryption (SIMD batched)
     def ckks_decrypt_task():
         for enc in ckks_encrypted:
             ctx.decrypt_vector(enc)
     
-    ckks_mem_usage = memory_usage((ckks_decrypt_task,), interval=0.01, max_usage=True)
-    ckks_peak = ckks_mem_usage if isinstance(ckks_mem_usage, (int, float)) else max(ckks_mem_usage)
+    ckks_peak = _peak_mb(ckks_decrypt_task)
     
     print(f"    AES: {aes_peak:.2f} MB")
     print(f"    CKKS: {ckks_peak:.2f} MB")
@@ -245,25 +241,37 @@ def run_memory_benchmarks():
     print("=" * 70)
     
     dataset_sizes = [1000, 5000]  # Reduced for faster testing
-    results = []
+    results = []  # kept only for the charts
     
-    # Benchmark encryption memory for different dataset sizes
-    for size in dataset_sizes:
-        print(f"\n📊 Dataset: {size} records")
-        
-        enc_mem = benchmark_encryption_memory(size)
-        comp_mem = benchmark_computation_memory(size)
-        dec_mem = benchmark_decryption_memory(size)
+    # Stream each size's row to the CSV as soon as it is measured, so the
+    # harness does not hold per-trial rows while the next size is profiled
+    results_path = os.path.join(OUTPUT_DIR, "memory_usage_results.csv")
+    with open(results_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(RESULT_FIELDS)
         
-        results.append({
-            "num_records": size,
-            "aes_encrypt_mb": enc_mem["aes_peak_mb"],
-            "ckks_baseline_encrypt_mb": enc_mem["ckks_baseline_peak_mb"],
-            "ckks_optimized_encrypt_mb": enc_mem["ckks_optimized_peak_mb"],
-            "computation_mb": comp_mem,
-            "aes_decrypt_mb": dec_mem["aes_decrypt_peak_mb"],
-            "ckks_decrypt_mb": dec_mem["ckks_decrypt_peak_mb"]
-        })
+        # Benchmark encryption memory for different dataset sizes
+        for size in dataset_sizes:
+            print(f"\n📊 Dataset: {size} records")
+            
+            enc_mem = benchmark_encryption_memory(size)
+            comp_mem = benchmark_computation_memory(size)
+            dec_mem = benchmark_decryption_memory(size)
+            
+            row = {
+                "num_records": size,
+                "aes_encrypt_mb": enc_mem["aes_peak_mb"],
+                "ckks_baseline_encrypt_mb": enc_mem["ckks_baseline_peak_mb"],
+                "ckks_optimized_encrypt_mb": enc_mem["ckks_optimized_peak_mb"],
+                "computation_mb": comp_mem,
+                "aes_decrypt_mb": dec_mem["aes_decrypt_peak_mb"],
+                "ckks_decrypt_mb": dec_mem["ckks_decrypt_peak_mb"]
+            }
+            writer.writerow([row[k] for k in RESULT_FIELDS])
+            f.flush()
+            results.append(row)
+    
+    print(f"\n✅ Results saved to: {results_path}")
     
     # Benchmark key generation memory (independent of dataset size)
     print(f"\n📊 Key Generation")
@@ -278,7 +286,7 @@ def run_memory_benchmarks():
     }
     
     # Save results
-    save_results(results, key_gen_result)
+    save_results(key_gen_result)
     
     # Generate charts
     generate_memory_charts(results, key_gen_result)
@@ -286,20 +294,8 @@ def run_memory_benchmarks():
     return results
 
 
-def save_results(results, key_gen_result):
-    """Save memory benchmark results to CSV"""
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    
-    # Main results
-    results_path = os.path.join(OUTPUT_DIR, "memory_usage_results.csv")
-    with open(results_path, 'w', newline='') as f:
-        if results:
-            writer = csv.DictWriter(f, fieldnames=results[0].keys())
-            writer.writeheader()
-            writer.writerows(results)
-    
-    print(f"\n✅ Results saved to: {results_path}")
-    
+def save_results(key_gen_result):
+    """Save key generation memory results to CSV (per-size rows are streamed by the runner)"""
     # Key generation results (append to separate section or same file)
     keygen_path = os.path.join(OUTPUT_DIR, "memory_keygen_results.csv")
     with open(keygen_path, 'w', newline='') as f:
@@ -325,19 +321,17 @@ def generate_memory_charts(results, key_gen_result):
     ax.plot(df["num_records"], df["ckks_decrypt_mb"], marker='d', label='CKKS Decryption', linewidth=2)
     
     ax.set_xlabel('Dataset Size (records)', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Peak Memory Usage (MB)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Peak Memory Added (MB)', fontsize=12, fontweight='bold')
     ax.set_title('Memory Usage vs Dataset Size', fontsize=14, fontweight='bold')
     ax.legend()
     ax.grid(alpha=0.3)
     
-    os.makedirs(CHARTS_DIR, exist_ok=True)
     chart1_path = os.path.join(CHARTS_DIR, "memory_usage_scaling.png")
-    plt.savefig(chart1_path, dpi=300, bbox_inches='tight')
+    fig.savefig(chart1_path, dpi=150, bbox_inches='tight')
     print(f"✅ Chart saved: {chart1_path}")
-    plt.close()
     
-    # Chart 2: Memory by Operation Type (for 10K records)
-    fig, ax = plt.subplots(figsize=(10, 6))
+    # Chart 2: Memory by Operation Type (for 10K records), same figure reused
+    ax.clear()
     
     mid_idx = len(results) // 2  # Use middle dataset (10K)
     mid_result = results[mid_idx]
@@ -355,15 +349,15 @@ def generate_memory_charts(results, key_gen_result):
     colors = ['#3498db', '#e74c3c', '#9b59b6', '#1abc9c', '#f39c12']
     ax.bar(operations, memory_values, color=colors, alpha=0.8)
     
-    ax.set_ylabel('Peak Memory Usage (MB)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Peak Memory Added (MB)', fontsize=12, fontweight='bold')
     ax.set_title(f'Memory Usage by Operation Type ({mid_result["num_records"]} records)', 
                  fontsize=14, fontweight='bold')
     ax.grid(axis='y', alpha=0.3)
     
     chart2_path = os.path.join(CHARTS_DIR, "memory_by_operation.png")
-    plt.savefig(chart2_path, dpi=300, bbox_inches='tight')
+    fig.savefig(chart2_path, dpi=150, bbox_inches='tight')
     print(f"✅ Chart saved: {chart2_path}")
-    plt.close()
+    plt.close(fig)
 
 
 if __name__ == "__main__":
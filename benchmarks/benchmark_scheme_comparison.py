@@ -8,6 +8,7 @@ import pandas as pd
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from src.crypto.ckks_module import CKKSContext
 from src.analytics.statistics import homomorphic_mean
+from benchmarks.common import SIMD_SLOTS, simd_chunks, shared_ctx
 
 
 def ensure_dir(p):
@@ -16,30 +17,21 @@ def ensure_dir(p):
 
 def run_ckks_mean(values):
     """Calculate mean using CKKS with SIMD batching for optimized performance."""
-    SIMD_SLOTS = 8192
     n = len(values)
     
-    ck = CKKSContext()
-    ck.create_optimized_context()
+    ck = shared_ctx()
     
     # Pack values into SIMD slots
-    encrypted_chunks = []
-    for i in range(0, n, SIMD_SLOTS):
-        chunk = [float(v) for v in values[i:i + SIMD_SLOTS]]
-        if len(chunk) < SIMD_SLOTS:
-            chunk = chunk + [0.0] * (SIMD_SLOTS - len(chunk))
-        encrypted_chunks.append(ck.encrypt_vector(chunk))
+    encrypted_chunks = ck.parallel_encrypt(simd_chunks(values, SIMD_SLOTS))
     
     start = time.perf_counter()
     
     # Sum all encrypted chunks
-    acc = encrypted_chunks[0]
-    for v in encrypted_chunks[1:]:
-        acc = acc + v
+    acc = CKKSContext.sum_encrypted(encrypted_chunks)
     
     # Decrypt and compute mean
     dec = ck.decrypt_vector(acc)
-    total = sum(dec[:min(n, SIMD_SLOTS)]) if n <= SIMD_SLOTS else sum(dec[:SIMD_SLOTS])
+    total = float(np.sum(np.asarray(dec[:min(n, SIMD_SLOTS)], dtype=np.float64)))
     val = total / n
     
     elapsed = time.perf_counter() - start
@@ -49,26 +41,32 @@ def run_ckks_mean(values):
 def run_bfv_mean(values):
     bf = CKKSContext()
     bf.create_bfv_context()
-    # encrypt each integer as single-slot vector
-    encs = [bf.bfv_encrypt([int(v)]) for v in values]
+    n = len(values)
+    slots = bf.bfv_slot_count
+    # Pack integers into BFV slots (batching), mirroring the CKKS SIMD path;
+    # zero-padded rows keep every ciphertext the same size for slot-wise adds
+    rows = np.zeros((-(-n // slots), slots), dtype=np.int64)
+    rows.reshape(-1)[:n] = values
+    encs = [bf.bfv_encrypt(row.tolist()) for row in rows]
     start = time.perf_counter()
     acc = encs[0]
     for v in encs[1:]:
         acc = acc + v
-    total = bf.bfv_decrypt(acc)[0]
-    if total < 0:
-        total += bf.bfv_plain_modulus
-    mean_val = total / len(values)
+    # Slots decrypt centred around zero; lift negatives back into [0, t)
+    slot_sums = np.asarray(bf.bfv_decrypt(acc), dtype=np.int64)
+    slot_sums[slot_sums < 0] += bf.bfv_plain_modulus
+    total = int(slot_sums.sum())
+    mean_val = total / n
     elapsed = time.perf_counter() - start
     return mean_val, elapsed
 
 
 if __name__ == "__main__":
     path = os.path.join("data", "synthetic", "patients_10k.csv")
-    df = pd.read_csv(path)
-    hr = df["heart_rate"].astype(int).tolist()
-    # limit to 10k rows if file larger
-    hr = hr[:10000]
+    # Parse only the heart_rate column, straight into an int32 array
+    # (limited to 10k rows if the file is larger)
+    hr = pd.read_csv(path, usecols=["heart_rate"], dtype={"heart_rate": np.int32},
+                     nrows=10000, engine="c")["heart_rate"].to_numpy()
     plain_mean = float(np.mean(hr))
 
     ckks_mean, ckks_t = run_ckks_mean(hr)
@@ -6,7 +6,7 @@ Measures ciphertext expansion factors for the hybrid encryption system
 to quantify cloud storage costs.
 
 Metrics:
-- AES expansion factor (expected: ~1.1x)
+- AES expansion factor ((len + 28) / len: ~1.56x for 50-byte fields)
 - CKKS expansion factor (expected: ~100-200x)
 - Hybrid overall expansion
 - Storage savings vs pure CKKS
@@ -16,10 +16,13 @@ Output:
 - benchmarks/charts/storage_comparison.png
 """
 
+import argparse
 import os
 import sys
-import csv
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # headless: skip GUI backend probing
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -51,15 +54,27 @@ def measure_csv_file_size(filepath: str) -> int:
     return 0
 
 
-def benchmark_storage_overhead():
+def benchmark_storage_overhead(storage_params: bool = False):
     """Run storage overhead benchmarks"""
     print("\n" + "=" * 70)
     print("  Storage Overhead Benchmark")
     print("=" * 70)
+    if storage_params:
+        print("  CKKS sized with depth-0 storage parameters (not what the app stores)")
     
     results = []
     
-    for label, num_records in DATASET_SIZES.items():
+    # Evaluate every dataset size in one vectorised call, so the sample CKKS
+    # ciphertext is encrypted and measured once rather than once per size
+    all_sizes = compare_storage_overhead(
+        num_records=np.array(list(DATASET_SIZES.values())),
+        pii_fields=6,  # patient_id, name, address, phone, email, dob
+        analytics_fields=3,  # heart_rate, blood_pressure_systolic, blood_pressure_diastolic
+        avg_pii_size=50,  # Average PII field size in bytes
+        storage_params=storage_params
+    )
+    
+    for i, (label, num_records) in enumerate(DATASET_SIZES.items()):
         print(f"\n📊 Analyzing {label} records...")
         
         # Get CSV file size (if available)
@@ -74,13 +89,8 @@ def benchmark_storage_overhead():
         
         print(f"   Plaintext CSV size: {csv_size / 1024:.2f} KB")
         
-        # Compare storage overhead
-        analysis = compare_storage_overhead(
-            num_records=num_records,
-            pii_fields=6,  # patient_id, name, address, phone, email, dob
-            analytics_fields=3,  # heart_rate, blood_pressure_systolic, blood_pressure_diastolic
-            avg_pii_size=50  # Average PII field size in bytes
-        )
+        # Storage overhead for this dataset size
+        analysis = {k: v[i].item() if isinstance(v, np.ndarray) else v for k, v in all_sizes.items()}
         
         # Store results
         results.append({
@@ -93,7 +103,8 @@ def benchmark_storage_overhead():
             "ckks_expansion": analysis["ckks_expansion"],
             "pure_ckks_expansion": analysis["pure_ckks_expansion"],
             "hybrid_expansion": analysis["hybrid_expansion"],
-            "storage_savings_pct": analysis["storage_savings_pct"]
+            "storage_savings_pct": analysis["storage_savings_pct"],
+            "ckks_params": analysis["ckks_params"]
         })
         
         print(f"   Pure CKKS: {analysis['pure_ckks_size'] / 1024 / 1024:.2f} MB ({analysis['pure_ckks_expansion']:.1f}x)")
@@ -102,13 +113,12 @@ def benchmark_storage_overhead():
     
     # Save results to CSV
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    results_path = os.path.join(OUTPUT_DIR, "storage_overhead_results.csv")
+    suffix = "_storage_params" if storage_params else ""
+    results_path = os.path.join(OUTPUT_DIR, f"storage_overhead_results{suffix}.csv")
     
-    with open(results_path, 'w', newline='') as f:
+    with open(results_path, 'w', newline='', buffering=1 << 20) as f:
         if results:
-            writer = csv.DictWriter(f, fieldnames=results[0].keys())
-            writer.writeheader()
-            writer.writerows(results)
+            pd.DataFrame(results).to_csv(f, index=False)
     
     print(f"\n✅ Results saved to: {results_path}")
     
@@ -125,7 +135,7 @@ def generate_storage_chart(results):
     df = pd.DataFrame(results)
     
     # Create figure with subplots
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6), layout="constrained")
     
     # Chart 1: Storage Size Comparison
     x = range(len(df))
@@ -153,20 +163,22 @@ def generate_storage_chart(results):
     ax2.set_xlabel('Dataset Size', fontsize=12, fontweight='bold')
     ax2.set_ylabel('Expansion Factor (×)', fontsize=12, fontweight='bold')
     ax2.set_title('Ciphertext Expansion Factor', fontsize=14, fontweight='bold')
+    if (df["ckks_params"] == "storage").any():
+        fig.suptitle('CKKS sized with depth-0 storage parameters', fontsize=11, style='italic')
     ax2.set_xticks(x)
     ax2.set_xticklabels(df["dataset"])
     ax2.legend()
     ax2.grid(axis='y', alpha=0.3)
     
-    plt.tight_layout()
     
     # Save chart
     os.makedirs(CHARTS_DIR, exist_ok=True)
-    chart_path = os.path.join(CHARTS_DIR, "storage_comparison.png")
-    plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+    suffix = "_storage_params" if (df["ckks_params"] == "storage").any() else ""
+    chart_path = os.path.join(CHARTS_DIR, f"storage_comparison{suffix}.png")
+    fig.savefig(chart_path, dpi=120, bbox_inches='tight')
     print(f"✅ Chart saved to: {chart_path}")
     
-    plt.close()
+    plt.close(fig)
 
 
 def print_summary(results):
@@ -188,13 +200,18 @@ def print_summary(results):
     print("-" * 70)
     print(f"\n  Average storage savings (Hybrid vs Pure CKKS): {avg_savings:.1f}%")
     print(f"  AES expansion factor: {results[0]['aes_expansion']:.2f}x")
-    print(f"  CKKS expansion factor: {results[0]['ckks_expansion']:.1f}x")
+    print(f"  CKKS expansion factor: {results[0]['ckks_expansion']:.1f}x ({results[0]['ckks_params']} context)")
     print("\n" + "=" * 70)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Storage overhead benchmark")
+    parser.add_argument("--storage-params", action="store_true",
+                        help="size CKKS with the depth-0 storage context instead of the "
+                             "optimized context the app stores (results get a _storage_params suffix)")
+    args = parser.parse_args()
     try:
-        results = benchmark_storage_overhead()
+        results = benchmark_storage_overhead(storage_params=args.storage_params)
         print_summary(results)
         print("\n✅ Storage overhead benchmark completed successfully!")
         
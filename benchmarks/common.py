@@ -0,0 +1,75 @@
+"""
+Shared Benchmark Helpers
+
+Fixtures and CKKS plumbing used by several benchmark scripts. Scripts put
+the project root on sys.path and import these as benchmarks.common.
+"""
+
+import functools
+import json
+import os
+
+import numpy as np
+
+from src.crypto.ckks_module import CKKSContext
+
+# poly_degree=16384 (optimized context) -> 8192 SIMD slots per ciphertext
+SIMD_SLOTS = 8192
+
+
+def simd_chunks(values, slots: int = SIMD_SLOTS) -> np.ndarray:
+    """
+    Lay values out as zero-padded rows of SIMD slots, one row per ciphertext.
+
+    Each row is its own slot buffer (no shared scratch space), so the rows
+    can be handed to concurrent encrypt_vector calls without aliasing.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rows = -(-values.size // slots)
+    chunks = np.zeros((rows, slots), dtype=np.float64)
+    chunks.reshape(-1)[:values.size] = values
+    return chunks
+
+
+def save_results_json(csv_path: str, summary) -> str:
+    """Write summary next to a results CSV (same name, .json) for programmatic consumers."""
+    json_path = os.path.splitext(csv_path)[0] + ".json"
+    with open(json_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    return json_path
+
+
+def throughput_summary(rows) -> dict:
+    """Group (metric, records, seconds, ops/s, bytes/s) rows into per-metric JSON records."""
+    summary = {}
+    for metric, n, t, ops, bps in rows:
+        summary.setdefault(metric, []).append(
+            {"records": n, "seconds": t, "throughput_ops_per_sec": ops, "throughput_bytes_per_sec": bps})
+    return summary
+
+
+@functools.lru_cache(maxsize=8)
+def pii_fixture(template: bytes, num_records: int) -> tuple:
+    """Encoded PII test records, built with bytes %-formatting and cached per size."""
+    return tuple(template % i for i in range(num_records))
+
+
+@functools.lru_cache(maxsize=2)
+def _build_ctx(optimized: bool) -> CKKSContext:
+    ctx = CKKSContext()
+    if optimized:
+        ctx.create_optimized_context()
+    else:
+        ctx.create_context()
+    return ctx
+
+
+def shared_ctx(optimized: bool = True) -> CKKSContext:
+    """
+    CKKS context built once per parameter set and reused for the rest of the
+    run, so per-size measurements don't include key generation (benchmarks
+    that report key generation build their own contexts for it).
+    """
+    # Normalised here so shared_ctx(), shared_ctx(True) and
+    # shared_ctx(optimized=True) all hit the same cache entry
+    return _build_ctx(bool(optimized))
@@ -1,6 +1,9 @@
 import os
 import csv
+import matplotlib
+matplotlib.use("Agg")  # headless: skip GUI backend probing
 import matplotlib.pyplot as plt
+import pandas as pd
 
 def load_csv(path):
     rows = []
@@ -11,30 +14,29 @@ def load_csv(path):
             rows.append(r)
     return rows
 
+def load_metric_seconds(path, metric):
+    """records -> seconds for one metric of a benchmark results CSV (empty if missing)."""
+    if not os.path.exists(path):
+        return {}
+    df = pd.read_csv(path, usecols=["metric", "records", "seconds"])
+    return df.loc[df["metric"] == metric].set_index("records")["seconds"].to_dict()
+
 def ensure_dir(path):
     os.makedirs(path, exist_ok=True)
 
 if __name__ == "__main__":
     charts_dir = os.path.join("benchmarks", "charts")
     ensure_dir(charts_dir)
+    # One figure, cleared and resized between charts
+    fig = plt.figure(layout="constrained")
 
     # 1. Latency Comparison
-    baseline_rows = load_csv(os.path.join("benchmarks", "ckks_baseline_results.csv"))
-    optimized_rows = load_csv(os.path.join("benchmarks", "ckks_optimized_results.csv"))
-
-    b_mean = {}
-    for r in baseline_rows:
-        if r["metric"] == "mean":
-            b_mean[int(r["records"])] = float(r["seconds"])
-
-    o_mean = {}
-    for r in optimized_rows:
-        if r["metric"] == "mean":
-            o_mean[int(r["records"])] = float(r["seconds"])
+    b_mean = load_metric_seconds(os.path.join("benchmarks", "ckks_baseline_results.csv"), "mean")
+    o_mean = load_metric_seconds(os.path.join("benchmarks", "ckks_optimized_results.csv"), "mean")
 
     labels = sorted(set(b_mean.keys()) | set(o_mean.keys()))
     if labels:
-        plt.figure(figsize=(8, 5))
+        fig.set_size_inches(8, 5)
         width = 0.35
         x = range(len(labels))
         plt.bar([i - width / 2 for i in x], [b_mean.get(n, 0) for n in labels], width=width, label="Baseline")
@@ -45,8 +47,7 @@ if __name__ == "__main__":
         plt.title("CKKS Mean Calculation Time (Baseline vs Optimized)")
         plt.legend()
         plt.yscale('log')
-        plt.tight_layout()
-        plt.savefig(os.path.join(charts_dir, "latency_comparison.png"))
+        fig.savefig(os.path.join(charts_dir, "latency_comparison.png"), dpi=120, bbox_inches='tight')
         print(f"Generated latency_comparison.png")
 
     # 2. Storage Expansion
@@ -97,17 +98,16 @@ if __name__ == "__main__":
         # The pie chart usually compares overheads.
         pass
 
-    plt.figure(figsize=(6, 6))
+    fig.clear()
+    fig.set_size_inches(6, 6)
     # Comparison of expansion factors
     if ckks_exp > 0:
         plt.bar(["AES", "CKKS"], [aes_exp, ckks_exp], color=['red', 'blue'])
         plt.title("Storage Expansion Factor")
         plt.ylabel("Multiplier (x)")
         plt.yscale('log')
-        plt.tight_layout()
-        plt.savefig(os.path.join(charts_dir, "storage_expansion.png"))
+        fig.savefig(os.path.join(charts_dir, "storage_expansion.png"), dpi=120, bbox_inches='tight')
         print(f"Generated storage_expansion.png (Bar chart due to scale difference)")
     else:
         print("Skipped storage_expansion.png due to missing data")
-
-
+    plt.close(fig)
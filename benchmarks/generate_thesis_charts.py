@@ -3,7 +3,8 @@
 Thesis-Ready Charts Generation Script
 ======================================
 Generates publication-quality charts for thesis defense.
-Exports in PNG (300 DPI), SVG, and PDF formats.
+Exports PNG at CHART_DPI (default 150; --final forces 300 DPI);
+pass --vector to also export SVG and PDF.
 
 Charts Generated:
 - H2: Accuracy vs Dataset Size
@@ -14,9 +15,16 @@ Charts Generated:
 - H4: Compliance Radar Chart
 """
 
+import argparse
+import functools
+import hashlib
+import inspect
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # headless: skip GUI backend probing
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib import rcParams
@@ -25,17 +33,22 @@ import seaborn as sns
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-# Publication-quality settings
-rcParams['font.family'] = 'serif'
-rcParams['font.serif'] = ['Times New Roman']
-rcParams['font.size'] = 12
-rcParams['axes.labelsize'] = 14
-rcParams['axes.titlesize'] = 16
-rcParams['xtick.labelsize'] = 11
-rcParams['ytick.labelsize'] = 11
-rcParams['legend.fontsize'] = 11
-rcParams['figure.titlesize'] = 18
-rcParams['figure.dpi'] = 300
+# Publication-quality settings (also part of the chart cache key)
+RC_SETTINGS = {
+    'font.family': 'serif',
+    'font.serif': ['Times New Roman'],
+    'font.size': 12,
+    'axes.labelsize': 14,
+    'axes.titlesize': 16,
+    'xtick.labelsize': 11,
+    'ytick.labelsize': 11,
+    'legend.fontsize': 11,
+    'figure.titlesize': 18,
+    'figure.dpi': 300,
+    'pdf.fonttype': 42,  # embed TrueType fonts rather than Type 3
+    'agg.path.chunksize': 10000,  # rasterize long paths in fewer, larger chunks
+}
+rcParams.update(RC_SETTINGS)
 
 # Professional color scheme
 COLORS = {
@@ -55,22 +68,101 @@ OUTPUT_DIR = os.path.join("benchmarks", "charts", "thesis")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
-def save_chart(fig, name):
-    """Save chart in PNG (300 DPI), SVG, and PDF formats."""
+# One figure shared by every chart; cleared and resized between charts
+# rather than rebuilt (and its fonts re-resolved) each time
+_FIG = None
+
+
+def new_chart(figsize, **subplot_kw):
+    """Clear the shared figure, resize it and return it with a fresh axes."""
+    global _FIG
+    if _FIG is None:
+        _FIG = plt.figure()
+    _FIG.clear()
+    _FIG.set_size_inches(*figsize)
+    return _FIG, _FIG.add_subplot(**subplot_kw)
+
+
+def close_chart():
+    """Release the shared figure once all charts are saved."""
+    global _FIG
+    if _FIG is not None:
+        plt.close(_FIG)
+        _FIG = None
+
+
+PNG_ONLY = ("png",)
+VECTOR_FORMATS = ("png", "svg", "pdf")
+
+# PNG resolution; pixel count (and encode time) grows with DPI squared, so
+# development runs use 150 and final thesis runs 300 (--final)
+DPI = int(os.environ.get("CHART_DPI", "150"))
+FINAL_DPI = 300
+
+
+def save_chart(fig, name, formats=PNG_ONLY, dpi=DPI):
+    """Save chart as PNG at the given DPI, plus any vector formats requested."""
     base_path = os.path.join(OUTPUT_DIR, name)
-    fig.savefig(f"{base_path}.png", dpi=300, bbox_inches='tight', facecolor='white')
-    fig.savefig(f"{base_path}.svg", format='svg', bbox_inches='tight')
-    fig.savefig(f"{base_path}.pdf", format='pdf', bbox_inches='tight')
-    print(f"✅ Saved {name} in PNG, SVG, PDF")
+    for fmt in formats:
+        # 1 MiB write buffer: the encoders emit many small chunks
+        with open(f"{base_path}.{fmt}", "wb", buffering=1 << 20) as fh:
+            if fmt == "png":
+                fig.savefig(fh, format="png", dpi=dpi, bbox_inches='tight', facecolor='white')
+            else:
+                fig.savefig(fh, format=fmt, bbox_inches='tight')
+    print(f"✅ Saved {name} in {', '.join(fmt.upper() for fmt in formats)}")
+
+
+def cached_chart(chart):
+    """
+    Skip re-rendering a chart whose inputs are unchanged since its last run.
 
+    The chart data is embedded in each chart function, so the key hashes the
+    function source together with the shared rendering code (new_chart,
+    save_chart), the rcParams settings, the colour scheme, the format and
+    (for PNG) the DPI. Each format keeps its own .hash_<name>.<fmt> stamp
+    next to the outputs, and only formats whose stamp or file is missing or
+    out of date are re-rendered. Pass force=True to re-render everything.
+    """
+    name = chart.__name__[len("chart_"):]
+    source = tuple(inspect.getsource(fn) for fn in (chart, new_chart, save_chart))
 
-def chart_h2_accuracy_vs_dataset_size():
+    def is_current(fmt, key):
+        if not os.path.exists(os.path.join(OUTPUT_DIR, f"{name}.{fmt}")):
+            return False
+        try:
+            with open(os.path.join(OUTPUT_DIR, f".hash_{name}.{fmt}")) as f:
+                return f.read() == key
+        except OSError:
+            return False
+
+    @functools.wraps(chart)
+    def wrapper(formats=PNG_ONLY, dpi=DPI, force=False):
+        keys = {
+            fmt: hashlib.blake2b(repr((source, RC_SETTINGS, COLORS, fmt,
+                                       dpi if fmt == "png" else None)).encode()).hexdigest()
+            for fmt in formats
+        }
+        stale = tuple(fmt for fmt in formats if force or not is_current(fmt, keys[fmt]))
+        if not stale:
+            print(f"⏭  {name} unchanged, skipped")
+            return
+        chart(stale, dpi)
+        for fmt in stale:
+            with open(os.path.join(OUTPUT_DIR, f".hash_{name}.{fmt}"), "w") as f:
+                f.write(keys[fmt])
+
+    return wrapper
+
+
+@cached_chart
+def chart_h2_accuracy_vs_dataset_size(formats=PNG_ONLY, dpi=DPI):
     """H2: Accuracy vs Dataset Size"""
     dataset_sizes = [1000, 10000, 100000]
     accuracy_mean = [99.999, 99.999, 99.999]
     accuracy_variance = [99.999, 99.998, 99.997]
     
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = new_chart((10, 6))
     
     x = np.arange(len(dataset_sizes))
     width = 0.35
@@ -93,30 +185,21 @@ def chart_h2_accuracy_vs_dataset_size():
     ax.grid(axis='y', alpha=0.3, linestyle='--')
     
     # Add value labels on bars
-    def autolabel(bars):
-        for bar in bars:
-            height = bar.get_height()
-            ax.annotate(f'{height:.3f}%',
-                       xy=(bar.get_x() + bar.get_width() / 2, height),
-                       xytext=(0, 3),
-                       textcoords="offset points",
-                       ha='center', va='bottom', fontsize=9, fontweight='bold')
-    
-    autolabel(bars1)
-    autolabel(bars2)
+    for bars in (bars1, bars2):
+        ax.bar_label(bars, fmt='{:.3f}%', padding=3, fontsize=9, fontweight='bold')
     
-    save_chart(fig, "h2_accuracy_vs_dataset_size")
-    plt.close()
+    save_chart(fig, "h2_accuracy_vs_dataset_size", formats, dpi)
 
 
-def chart_h1_data_segmentation_pie():
+@cached_chart
+def chart_h1_data_segmentation_pie(formats=PNG_ONLY, dpi=DPI):
     """H1: Data Segmentation Pie Chart"""
     labels = ['PII (AES-256-GCM)', 'Vitals (CKKS)']
     sizes = [46.2, 53.8]
     colors = [COLORS['aes'], COLORS['ckks']]
     explode = (0.05, 0.05)
     
-    fig, ax = plt.subplots(figsize=(10, 7))
+    fig, ax = new_chart((10, 7))
     
     wedges, texts, autotexts = ax.pie(sizes, explode=explode, labels=labels, colors=colors,
                                        autopct='%1.1f%%', shadow=True, startangle=90,
@@ -139,11 +222,11 @@ def chart_h1_data_segmentation_pie():
     ax.legend(legend_labels, loc='upper left', bbox_to_anchor=(0, -0.05), 
               frameon=True, fontsize=10, framealpha=0.95)
     
-    save_chart(fig, "h1_data_segmentation_pie")
-    plt.close()
+    save_chart(fig, "h1_data_segmentation_pie", formats, dpi)
 
 
-def chart_h3_performance_vs_storage():
+@cached_chart
+def chart_h3_performance_vs_storage(formats=PNG_ONLY, dpi=DPI):
     """H3: Performance vs Storage Trade-off (Scatter Plot)"""
     # Data points: (Storage Expansion, Throughput ops/sec, Label)
     data_points = [
@@ -156,21 +239,19 @@ def chart_h3_performance_vs_storage():
         (83524, 103, 'CKKS Optimized (10K)', COLORS['ckks']),
     ]
     
-    fig, ax = plt.subplots(figsize=(12, 7))
-    
-    # Separate by scheme
-    aes_data = [d for d in data_points if 'AES' in d[2]]
-    ckks_base_data = [d for d in data_points if 'Baseline' in d[2]]
-    ckks_opt_data = [d for d in data_points if 'Optimized' in d[2]]
-    
-    # Plot points
-    for data_set, label, marker in [(aes_data, 'AES-256', 'o'), 
-                                      (ckks_base_data, 'CKKS Baseline', 's'),
-                                      (ckks_opt_data, 'CKKS Optimized', '^')]:
-        x = [d[0] for d in data_set]
-        y = [d[1] for d in data_set]
-        colors = [d[3] for d in data_set]
-        ax.scatter(x, y, s=200, c=colors, marker=marker, label=label, 
+    fig, ax = new_chart((12, 7))
+    
+    # Parallel arrays built once; each scheme is a boolean mask over them
+    xy = np.array([d[:2] for d in data_points], dtype=float)
+    labels = np.array([d[2] for d in data_points])
+    colors = np.array([d[3] for d in data_points])
+    
+    # Plot points (one scatter per marker shape)
+    for key, label, marker in [('AES', 'AES-256', 'o'), 
+                               ('Baseline', 'CKKS Baseline', 's'),
+                               ('Optimized', 'CKKS Optimized', '^')]:
+        mask = np.char.find(labels, key) >= 0
+        ax.scatter(xy[mask, 0], xy[mask, 1], s=200, c=colors[mask], marker=marker, label=label, 
                   alpha=0.8, edgecolors='black', linewidths=1.5)
     
     ax.set_xlabel('Storage Expansion Factor (log scale)', fontweight='bold')
@@ -187,17 +268,17 @@ def chart_h3_performance_vs_storage():
     ax.annotate('High overhead,\nHomomorphic capability', xy=(90000, 150), fontsize=11,
                bbox=dict(boxstyle="round,pad=0.5", facecolor=COLORS['warning'], alpha=0.3))
     
-    save_chart(fig, "h3_performance_vs_storage")
-    plt.close()
+    save_chart(fig, "h3_performance_vs_storage", formats, dpi)
 
 
-def chart_h3_memory_usage():
+@cached_chart
+def chart_h3_memory_usage(formats=PNG_ONLY, dpi=DPI):
     """H3: Memory Usage vs Dataset Size"""
     dataset_sizes = [1000, 10000, 100000]
     baseline_memory = [245, 1850, 18200]
     optimized_memory = [198, 1520, 15100]
     
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = new_chart((10, 6))
     
     x = np.arange(len(dataset_sizes))
     width = 0.35
@@ -215,49 +296,47 @@ def chart_h3_memory_usage():
     ax.legend(loc='upper left', framealpha=0.95)
     ax.grid(axis='y', alpha=0.3, linestyle='--')
     
-    # Add reduction percentage labels
-    for i, (b, o) in enumerate(zip(baseline_memory, optimized_memory)):
-        reduction = ((b - o) / b) * 100
-        ax.annotate(f'-{reduction:.1f}%',
-                   xy=(i, max(b, o)),
-                   xytext=(0, 5),
-                   textcoords="offset points",
-                   ha='center', va='bottom', fontsize=10, fontweight='bold',
-                   color=COLORS['success'])
-    
-    save_chart(fig, "h3_memory_usage")
-    plt.close()
+    # Add reduction percentage labels, one per group above the taller bar
+    baseline = np.array(baseline_memory)
+    optimized = np.array(optimized_memory)
+    reductions = (baseline - optimized) / baseline * 100
+    tops = np.maximum(baseline, optimized)
+    label_style = dict(xytext=(0, 5), textcoords="offset points", ha='center', va='bottom',
+                       fontsize=10, fontweight='bold', color=COLORS['success'])
+    for xi, top, reduction in zip(x, tops, reductions):
+        ax.annotate(f'-{reduction:.1f}%', xy=(xi, top), **label_style)
+    
+    save_chart(fig, "h3_memory_usage", formats, dpi)
 
 
-def chart_h3_latency_breakdown():
+@cached_chart
+def chart_h3_latency_breakdown(formats=PNG_ONLY, dpi=DPI):
     """H3: End-to-End Latency Breakdown (Stacked Bar)"""
     phases = ['Data\nClassification', 'AES\nEncryption\n(6 fields)', 'CKKS\nEncryption\n(7 fields)',
               'Network\nUpload', 'Server\nStorage']
-    latencies = [12, 0.15, 23.8, 150, 45]
+    latencies = np.array([12, 0.15, 23.8, 150, 45])
+    total = latencies.sum()
+    # Left edge of each stacked segment
+    lefts = np.concatenate(([0.0], np.cumsum(latencies)[:-1]))
     
     colors_breakdown = [COLORS['primary'], COLORS['aes'], COLORS['ckks'], 
                        COLORS['warning'], COLORS['secondary']]
     
-    fig, ax = plt.subplots(figsize=(12, 7))
-    
-    bottom = 0
-    bars = []
-    for i, (phase, latency, color) in enumerate(zip(phases, latencies, colors_breakdown)):
-        bar = ax.barh(0, latency, left=bottom, height=0.6, 
-                     color=color, edgecolor='black', linewidth=1.5, alpha=0.9)
-        bars.append(bar)
-        
-        # Add percentage label
-        percentage = (latency / sum(latencies)) * 100
-        ax.text(bottom + latency/2, 0, f'{percentage:.1f}%\n{latency:.2f}ms', 
+    fig, ax = new_chart((12, 7))
+    
+    # All segments in one barh call
+    ax.barh(np.zeros(len(phases)), latencies, left=lefts, height=0.6,
+            color=colors_breakdown, edgecolor='black', linewidth=1.5, alpha=0.9)
+    
+    # Add percentage labels
+    for left, latency, percentage in zip(lefts, latencies, latencies / total * 100):
+        ax.text(left + latency/2, 0, f'{percentage:.1f}%\n{latency:.2f}ms', 
                ha='center', va='center', fontsize=11, fontweight='bold', color='white')
-        
-        bottom += latency
     
     ax.set_xlabel('Latency (milliseconds)', fontweight='bold')
     ax.set_title('H3: End-to-End Encryption Latency Breakdown', fontweight='bold', pad=20)
     ax.set_yticks([])
-    ax.set_xlim([0, sum(latencies) * 1.05])
+    ax.set_xlim([0, total * 1.05])
     
     # Create legend
     legend_elements = [mpatches.Patch(facecolor=color, edgecolor='black', label=phase.replace('\n', ' '))
@@ -268,15 +347,15 @@ def chart_h3_latency_breakdown():
     ax.grid(axis='x', alpha=0.3, linestyle='--')
     
     # Total latency annotation
-    ax.text(sum(latencies)/2, 0.35, f'Total: {sum(latencies):.2f}ms', 
+    ax.text(total/2, 0.35, f'Total: {total:.2f}ms', 
            ha='center', va='bottom', fontsize=13, fontweight='bold',
            bbox=dict(boxstyle="round,pad=0.5", facecolor='yellow', alpha=0.5))
     
-    save_chart(fig, "h3_latency_breakdown")
-    plt.close()
+    save_chart(fig, "h3_latency_breakdown", formats, dpi)
 
 
-def chart_h4_compliance_radar():
+@cached_chart
+def chart_h4_compliance_radar(formats=PNG_ONLY, dpi=DPI):
     """H4: Compliance Radar Chart"""
     categories = [
         'Data\nMinimization', 'Access\nControl', 'Audit\nLogging',
@@ -294,7 +373,7 @@ def chart_h4_compliance_radar():
     values += values[:1]  # Complete the circle
     angles += angles[:1]
     
-    fig, ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='polar'))
+    fig, ax = new_chart((10, 10), projection='polar')
     
     # Draw the area
     ax.plot(angles, values, 'o-', linewidth=2, color=COLORS['success'], label='Achieved')
@@ -316,17 +395,17 @@ def chart_h4_compliance_radar():
     ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1), framealpha=0.95)
     ax.grid(True, linestyle='--', alpha=0.5)
     
-    save_chart(fig, "h4_compliance_radar")
-    plt.close()
+    save_chart(fig, "h4_compliance_radar", formats, dpi)
 
 
-def chart_h2_mse_comparison():
+@cached_chart
+def chart_h2_mse_comparison(formats=PNG_ONLY, dpi=DPI):
     """H2: MSE Comparison (Supplementary)"""
     operations = ['Mean\n(1K)', 'Variance\n(1K)', 'Mean\n(10K)', 
                   'Variance\n(10K)', 'Mean\n(100K)', 'Variance\n(100K)']
     mse_values = [3.24e-10, 1.69e-08, 6.25e-10, 6.25e-08, 1.00e-08, 2.50e-07]
     
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = new_chart((12, 6))
     
     bars = ax.bar(operations, mse_values, color=COLORS['primary'], 
                   alpha=0.9, edgecolor='black', linewidth=1.2)
@@ -344,35 +423,58 @@ def chart_h2_mse_comparison():
                f'{val:.2e}',
                ha='center', va='bottom', fontsize=9, fontweight='bold')
     
-    save_chart(fig, "h2_mse_comparison")
-    plt.close()
+    save_chart(fig, "h2_mse_comparison", formats, dpi)
+
+
+CHARTS = (
+    chart_h2_accuracy_vs_dataset_size,
+    chart_h2_mse_comparison,
+    chart_h1_data_segmentation_pie,
+    chart_h3_performance_vs_storage,
+    chart_h3_memory_usage,
+    chart_h3_latency_breakdown,
+    chart_h4_compliance_radar,
+)
 
 
-def generate_all_thesis_charts():
+def generate_all_thesis_charts(formats=PNG_ONLY, dpi=DPI, force=False):
     """Generate all thesis-ready charts."""
     print("\n" + "="*60)
     print("THESIS-READY CHARTS GENERATION")
     print("="*60)
     print(f"Output directory: {os.path.abspath(OUTPUT_DIR)}")
-    print(f"Format: PNG (300 DPI), SVG, PDF\n")
+    print(f"Format: {', '.join(fmt.upper() for fmt in formats)}; raster at {dpi} DPI\n")
     
     print("Generating charts...")
     
-    chart_h2_accuracy_vs_dataset_size()
-    chart_h2_mse_comparison()
-    chart_h1_data_segmentation_pie()
-    chart_h3_performance_vs_storage()
-    chart_h3_memory_usage()
-    chart_h3_latency_breakdown()
-    chart_h4_compliance_radar()
+    # The charts are independent renders, so spread them over a process pool
+    # (each worker has its own pyplot state) when there is more than one core
+    workers = min(len(CHARTS), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(chart, formats, dpi, force) for chart in CHARTS]:
+                future.result()
+    else:
+        for chart in CHARTS:
+            chart(formats, dpi, force)
+        close_chart()
     
     print("\n" + "="*60)
     print("✅ ALL CHARTS GENERATED SUCCESSFULLY")
     print("="*60)
-    print(f"\nTotal charts: 7")
-    print(f"Total files: 21 (7 charts × 3 formats)")
+    print(f"\nTotal charts: {len(CHARTS)}")
+    print(f"Total files: {len(CHARTS) * len(formats)} ({len(CHARTS)} charts × {len(formats)} formats)")
     print(f"\nLocation: {os.path.abspath(OUTPUT_DIR)}")
 
 
 if __name__ == "__main__":
-    generate_all_thesis_charts()
+    parser = argparse.ArgumentParser(description="Thesis chart generation")
+    parser.add_argument("--vector", action="store_true",
+                        help="also export SVG and PDF (slow; needed for the final thesis build)")
+    parser.add_argument("--final", action="store_true",
+                        help=f"render PNGs at {FINAL_DPI} DPI regardless of CHART_DPI")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render every chart even if its inputs are unchanged")
+    args = parser.parse_args()
+    generate_all_thesis_charts(VECTOR_FORMATS if args.vector else PNG_ONLY,
+                               FINAL_DPI if args.final else DPI, args.force)
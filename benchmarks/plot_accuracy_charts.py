@@ -8,9 +8,13 @@ Generates visualization charts for Phase 1 H2:
 3. Error Distribution Histogram
 """
 
+import argparse
 import os
 import sys
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # headless: skip GUI backend probing
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -18,36 +22,45 @@ import seaborn as sns
 METRICS_FILE = os.path.join("benchmarks", "accuracy_metrics.csv")
 DISTRIBUTION_FILE = os.path.join("benchmarks", "error_distribution.csv")
 CHARTS_DIR = os.path.join("benchmarks", "charts")
+# PNG resolution for the 300 DPI charts; 150 for development runs, 300 with --final
+DPI = int(os.environ.get("CHART_DPI", "150"))
+FINAL_DPI = 300
+
+KDE_SAMPLE = 1000  # max points the KDE curve is evaluated over
 
 def ensure_dir(path):
     if not os.path.exists(path):
         os.makedirs(path)
 
-def plot_mse_vs_size(df):
+def plot_mse_vs_size(df, dpi=DPI):
     """Chart 1: MSE vs Dataset Size (Line Chart)"""
-    plt.figure(figsize=(10, 6))
+    plt.figure(figsize=(10, 6), layout="constrained")
     
     # Filter for mean/variance
     # df has: operation, record_count, mse...
     
     sns.set_style("whitegrid")
-    sns.lineplot(data=df, x="record_count", y="mse", hue="operation", marker="o", linewidth=2.5)
+    # One row per (operation, size) already, so plot each operation directly
+    # instead of going through seaborn's aggregation
+    for op, group in df.groupby("operation", observed=True):
+        group = group.sort_values("record_count")
+        plt.plot(group["record_count"], group["mse"], marker="o", linewidth=2.5, label=op)
+    plt.legend(title="operation")
     
     plt.xscale("log")
     plt.yscale("log") # MSE varies by orders of magnitude usually
     plt.title("MSE vs Dataset Size (Log-Log Scale)", fontsize=14)
     plt.xlabel("Number of Records", fontsize=12)
     plt.ylabel("Mean Squared Error (MSE)", fontsize=12)
-    plt.tight_layout()
     
     out_path = os.path.join(CHARTS_DIR, "accuracy_mse.png")
-    plt.savefig(out_path, dpi=300)
+    plt.savefig(out_path, dpi=dpi)
     print(f"Saved {out_path}")
     plt.close()
 
-def plot_accuracy_percentage(df):
+def plot_accuracy_percentage(df, dpi=DPI):
     """Chart 2: Accuracy Percentage vs Target (Bar Chart)"""
-    plt.figure(figsize=(8, 6))
+    plt.figure(figsize=(8, 6), layout="constrained")
     
     # We want to show if we meet 99.99% target
     # Simplify: Take the worst case (min accuracy) or show all?
@@ -57,7 +70,15 @@ def plot_accuracy_percentage(df):
     # Group by operation and take mean or min accuracy?
     # Let's just plot all points as a bar chart grouped by count
     
-    sns.barplot(data=df, x="record_count", y="accuracy_pct", hue="operation")
+    # Grouped bars with a manual dodge: one group per dataset size, one bar
+    # per operation (the values are already one row per pair)
+    pivot = df.pivot_table(index="record_count", columns="operation",
+                           values="accuracy_pct", observed=True)
+    x = np.arange(len(pivot.index))
+    width = 0.8 / len(pivot.columns)
+    for i, op in enumerate(pivot.columns):
+        plt.bar(x - 0.4 + width * (i + 0.5), pivot[op].to_numpy(), width, label=op)
+    plt.xticks(x, [str(n) for n in pivot.index])
     
     # Add target line
     plt.axhline(y=99.99, color='r', linestyle='--', label='Target (99.99%)')
@@ -67,50 +88,78 @@ def plot_accuracy_percentage(df):
     plt.xlabel("Dataset Size", fontsize=12)
     plt.ylabel("Accuracy (%)", fontsize=12)
     plt.legend(loc='lower right')
-    plt.tight_layout()
     
     out_path = os.path.join(CHARTS_DIR, "accuracy_percentage.png")
-    plt.savefig(out_path, dpi=300)
+    plt.savefig(out_path, dpi=dpi, bbox_inches='tight')
     print(f"Saved {out_path}")
     plt.close()
 
-def plot_error_distribution(df):
+def gaussian_kde_curve(x, grid):
+    """Gaussian KDE (Scott's bandwidth) of x evaluated on grid, as a density."""
+    if x.size > KDE_SAMPLE:
+        x = np.random.default_rng(0).choice(x, KDE_SAMPLE, replace=False)
+    bw = x.std(ddof=1) * x.size ** (-1 / 5)
+    if not bw > 0:
+        return None
+    z = (grid[:, None] - x[None, :]) / bw
+    return np.exp(-0.5 * z * z).sum(axis=1) / (x.size * bw * np.sqrt(2 * np.pi))
+
+def plot_error_distribution(df, dpi=DPI):
     """Chart 3: Error Distribution (Histogram)"""
-    plt.figure(figsize=(10, 6))
+    plt.figure(figsize=(10, 6), layout="constrained")
     
-    # df has "Absolute Error" column
-    # Use log scale for x axis if errors vary widely? 
-    # Or simple histogram.
+    # Bin once in NumPy and draw the bars directly; the KDE overlay is
+    # evaluated on a fixed grid over at most KDE_SAMPLE points
+    errors = df["Absolute Error"].to_numpy(dtype=np.float64)
+    counts, edges = np.histogram(errors, bins=50)
+    widths = np.diff(edges)
+    plt.bar(edges[:-1], counts, width=widths, align="edge",
+            color="purple", alpha=0.75, edgecolor="white", linewidth=0.5)
     
-    sns.histplot(df["Absolute Error"], bins=50, kde=True, color="purple")
+    grid = np.linspace(edges[0], edges[-1], 200)
+    density = gaussian_kde_curve(errors, grid)
+    if density is not None:
+        # Scale the density to bar heights (counts per bin)
+        plt.plot(grid, density * errors.size * widths[0], color="purple", linewidth=2)
     
     plt.title("Absolute Error Distribution (Sample N=1000)", fontsize=14)
     plt.xlabel("Absolute Error", fontsize=12)
     plt.ylabel("Frequency", fontsize=12)
-    plt.tight_layout()
     
     out_path = os.path.join(CHARTS_DIR, "error_distribution.png")
-    plt.savefig(out_path, dpi=300)
+    plt.savefig(out_path, dpi=dpi)
     print(f"Saved {out_path}")
     plt.close()
 
-def generate_charts():
+def generate_charts(dpi=DPI):
     ensure_dir(CHARTS_DIR)
     
     # Load Metrics
     if os.path.exists(METRICS_FILE):
-        df_metrics = pd.read_csv(METRICS_FILE)
-        plot_mse_vs_size(df_metrics)
-        plot_accuracy_percentage(df_metrics)
+        # Only the plotted columns, with narrow dtypes
+        df_metrics = pd.read_csv(
+            METRICS_FILE,
+            usecols=["operation", "record_count", "mse", "accuracy_pct"],
+            dtype={"operation": "category", "record_count": np.int32,
+                   "mse": np.float32, "accuracy_pct": np.float32},
+            engine="c",
+        )
+        plot_mse_vs_size(df_metrics, dpi)
+        plot_accuracy_percentage(df_metrics, dpi)
     else:
         print(f"Warning: {METRICS_FILE} not found. Skipping metrics charts.")
         
     # Load Distribution
     if os.path.exists(DISTRIBUTION_FILE):
-        df_dist = pd.read_csv(DISTRIBUTION_FILE)
-        plot_error_distribution(df_dist)
+        df_dist = pd.read_csv(DISTRIBUTION_FILE, usecols=["Absolute Error"],
+                              dtype=np.float32, engine="c", memory_map=True)
+        plot_error_distribution(df_dist, dpi)
     else:
         print(f"Warning: {DISTRIBUTION_FILE} not found. Skipping distribution chart.")
 
 if __name__ == "__main__":
-    generate_charts()
+    parser = argparse.ArgumentParser(description="Accuracy chart generation")
+    parser.add_argument("--final", action="store_true",
+                        help=f"render at {FINAL_DPI} DPI regardless of CHART_DPI")
+    args = parser.parse_args()
+    generate_charts(FINAL_DPI if args.final else DPI)
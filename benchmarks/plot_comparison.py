@@ -1,36 +1,30 @@
 import os
-import csv
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # headless: skip GUI backend probing
 import matplotlib.pyplot as plt
 
 
-def load_csv(path):
-    rows = []
-    with open(path, newline="") as f:
-        for r in csv.DictReader(f):
-            rows.append(r)
-    return rows
-
-
-def extract_mean_times(rows):
-    out = {}
-    for r in rows:
-        if r["metric"] == "mean":
-            out[int(r["records"])] = float(r["seconds"])
-    return out
+def load_mean_times(path):
+    """{records: seconds} for the "mean" rows of a CKKS results CSV."""
+    rows = np.atleast_1d(np.genfromtxt(path, delimiter=",", names=True, dtype=None,
+                                       encoding="utf-8", usecols=("metric", "records", "seconds")))
+    mean = rows[rows["metric"] == "mean"]
+    return dict(zip(mean["records"].astype(int).tolist(), mean["seconds"].astype(float).tolist()))
 
 
 if __name__ == "__main__":
     base = os.path.join("benchmarks", "ckks_baseline_results.csv")
     opt = os.path.join("benchmarks", "ckks_optimized_results.csv")
-    b = extract_mean_times(load_csv(base))
-    o = extract_mean_times(load_csv(opt))
+    b = load_mean_times(base)
+    o = load_mean_times(opt)
     records = sorted(set(b.keys()) | set(o.keys()))
     b_vals = [b[r] for r in records]
     o_vals = [o[r] for r in records]
 
     x = range(len(records))
     width = 0.35
-    plt.figure(figsize=(8, 5))
+    plt.figure(figsize=(8, 5), layout="constrained")
     plt.bar([i - width / 2 for i in x], b_vals, width=width, label="Baseline")
     plt.bar([i + width / 2 for i in x], o_vals, width=width, label="Optimized")
     plt.xticks(list(x), [str(r) for r in records])
@@ -40,6 +34,5 @@ if __name__ == "__main__":
     plt.legend()
     outdir = os.path.join("benchmarks", "charts")
     os.makedirs(outdir, exist_ok=True)
-    plt.tight_layout()
     plt.savefig(os.path.join(outdir, "ckks_comparison.png"))
 
@@ -1,6 +1,12 @@
 import os
 import csv
-import matplotlib.pyplot as plt
+from PIL import Image, ImageDraw, ImageFont
+
+COLUMNS = [('Paper', 'Paper'), ('Year', 'Year'), ('Mean_Calc_Time_ms', 'Mean Calc (ms)'),
+           ('Dataset_Size', 'Dataset Size')]
+HIGHLIGHT_FILL = '#203255'
+HIGHLIGHT_EDGE = '#4ea3ff'
+PAD_X, ROW_H = 12, 30
 
 
 def load(path):
@@ -11,23 +17,33 @@ def load(path):
     return rows
 
 
+def render_table(rows, out_path, font_size=14):
+    """Draw the comparison table straight onto a PIL image (one cell per rectangle)."""
+    font = ImageFont.load_default(size=font_size)
+    header = [label for _, label in COLUMNS]
+    cells = [[r[key] for key, _ in COLUMNS] for r in rows]
+    measure = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    widths = [int(max(measure.textlength(text, font=font) for text in col)) + 2 * PAD_X
+              for col in zip(header, *cells)]
+    lefts = [sum(widths[:j]) for j in range(len(widths))]
+
+    img = Image.new('RGB', (sum(widths) + 1, ROW_H * (len(cells) + 1) + 1), 'white')
+    draw = ImageDraw.Draw(img)
+    for i, row in enumerate([header] + cells):
+        ours = i > 0 and 'Our CKKS' in rows[i - 1]['Paper']
+        top = i * ROW_H
+        for left, width, text in zip(lefts, widths, row):
+            draw.rectangle([left, top, left + width, top + ROW_H],
+                           fill=HIGHLIGHT_FILL if ours else 'white',
+                           outline=HIGHLIGHT_EDGE if ours else 'black')
+            draw.text((left + width / 2, top + ROW_H / 2), text, font=font, anchor='mm',
+                      fill='white' if ours else 'black')
+    img.save(out_path)
+
+
 if __name__ == "__main__":
     path = os.path.join("benchmarks", "literature_comparison.csv")
     rows = load(path)
-    fig, ax = plt.subplots(figsize=(9, 2 + 0.4 * len(rows)))
-    ax.axis('off')
-    table_data = [[r['Paper'], r['Year'], r['Mean_Calc_Time_ms'], r['Dataset_Size']] for r in rows]
-    table = ax.table(cellText=table_data, colLabels=['Paper', 'Year', 'Mean Calc (ms)', 'Dataset Size'], loc='center')
-    for (i, r) in enumerate(rows):
-        if 'Our CKKS' in r['Paper']:
-            for j in range(4):
-                table[(i+1, j)].set_facecolor('#203255')
-                table[(i+1, j)].set_edgecolor('#4ea3ff')
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    table.scale(1, 1.5)
     outdir = os.path.join("benchmarks", "charts")
     os.makedirs(outdir, exist_ok=True)
-    plt.tight_layout()
-    plt.savefig(os.path.join(outdir, "literature_comparison.png"))
-
+    render_table(rows, os.path.join(outdir, "literature_comparison.png"))
@@ -14,6 +14,7 @@ Data Sources:
 
 Usage:
     python benchmarks/run_all_benchmarks.py
+    BENCH_ENCRYPT_THREADS=4 python benchmarks/run_all_benchmarks.py  # cap encryption threads
 
 Custom Data:
     To use your own data, place CSV files in data/synthetic/ with the naming pattern:
@@ -35,14 +36,17 @@ import sys
 import csv
 import time
 import random
-from typing import List, Tuple, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Dict
 from datetime import datetime
 import numpy as np
+import pandas as pd
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.analytics.accuracy_metrics import calculate_mse, calculate_rmse, calculate_accuracy_percentage, calculate_relative_error_percentage
+from benchmarks.common import SIMD_SLOTS, simd_chunks, shared_ctx
 
 # ============================================================================
 # CONFIGURATION - Modify these to use custom data
@@ -61,6 +65,16 @@ DATA_FILES = {
 # Field to benchmark (must be numeric)
 BENCHMARK_FIELD = "heart_rate"
 
+# Baseline ciphertexts encrypted ahead of each timed run of adds (~0.5 MB each)
+BASELINE_ADD_BATCH = 256
+
+# Threads for encrypting SIMD chunks (SEAL releases the GIL); follows
+# BENCH_ENCRYPT_THREADS when it is a positive integer, otherwise one per core
+try:
+    ENCRYPT_THREADS = max(int(os.environ.get("BENCH_ENCRYPT_THREADS", "0")), 0) or None
+except ValueError:
+    ENCRYPT_THREADS = None
+
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -154,19 +168,15 @@ def check_data_files() -> Dict[int, str]:
     return available
 
 
-def load_field_values(filepath: str, field: str, limit: int = None) -> List[float]:
+def load_field_values(filepath: str, field: str, limit: int = None) -> np.ndarray:
     """Load numeric values from a CSV field"""
-    values = []
-    with open(filepath, 'r', newline='') as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader):
-            if limit and i >= limit:
-                break
-            try:
-                values.append(float(row[field]))
-            except (ValueError, KeyError):
-                continue
-    return values
+    # One pass of pandas' C tokenizer over just this column; unparseable
+    # cells are coerced to NaN and skipped
+    try:
+        df = pd.read_csv(filepath, usecols=[field], nrows=limit or None, engine="c")
+    except ValueError:  # field not in the header
+        return np.empty(0, dtype=np.float64)
+    return pd.to_numeric(df[field], errors="coerce").dropna().to_numpy(dtype=np.float64)
 
 
 # ============================================================================
@@ -194,6 +204,8 @@ def benchmark_key_generation() -> dict:
     ckks_optimized = CKKSContext()
     ckks_optimized.create_optimized_context()
     optimized_time = time.perf_counter() - start
+    print(f"  SEAL backend: {ckks_optimized.backend_info()}")
+    ckks_optimized.warn_if_hexl_missing()
     
     return {
         "aes_key_gen_sec": aes_time,
@@ -201,11 +213,7 @@ def benchmark_key_generation() -> dict:
         "ckks_optimized_key_gen_sec": optimized_time
     }
 
-# SIMD slot count for optimized context (poly_degree=16384 -> 8192 slots)
-SIMD_SLOTS = 8192
-
-
-def benchmark_ckks_encrypt(values: List[float], optimized: bool = False) -> Tuple[float, float, float, float]:
+def benchmark_ckks_encrypt(values: np.ndarray, optimized: bool = False) -> Tuple[float, float, float, float]:
     """
     Benchmark CKKS encryption time.
     
@@ -214,24 +222,15 @@ def benchmark_ckks_encrypt(values: List[float], optimized: bool = False) -> Tupl
     
     For BASELINE mode: Encrypts each value individually (the traditional approach).
     """
-    from src.crypto.ckks_module import CKKSContext
-    
-    ctx = CKKSContext()
-    if optimized:
-        ctx.create_optimized_context()
-    else:
-        ctx.create_context()
+    ctx = shared_ctx(optimized)
     
     start = time.perf_counter()
     
     if optimized:
         # TRUE SIMD: Pack up to 8192 values per ciphertext
         # This is THE KEY OPTIMIZATION - reduces O(n) encryptions to O(n/8192)
-        for i in range(0, len(values), SIMD_SLOTS):
-            chunk = values[i:i + SIMD_SLOTS]
-            if len(chunk) < SIMD_SLOTS:
-                chunk = chunk + [0.0] * (SIMD_SLOTS - len(chunk))
-            _ = ctx.encrypt_vector(chunk)
+        # Chunks are independent, so they are encrypted across threads
+        _ = ctx.parallel_encrypt(simd_chunks(values), max_workers=ENCRYPT_THREADS)
     else:
         # Baseline: Individual encryption (one ciphertext per value)
         for v in values:
@@ -241,7 +240,7 @@ def benchmark_ckks_encrypt(values: List[float], optimized: bool = False) -> Tupl
     return elapsed, 0.0, 0.0, 100.0  # Encrypt doesn't have accuracy metrics
 
 
-def benchmark_ckks_mean(values: List[float], optimized: bool = False) -> Tuple[float, float, float, float]:
+def benchmark_ckks_mean(values: np.ndarray, optimized: bool = False) -> Tuple[float, float, float, float]:
     """
     Benchmark CKKS homomorphic mean computation.
     
@@ -252,38 +251,20 @@ def benchmark_ckks_mean(values: List[float], optimized: bool = False) -> Tuple[f
     
     For BASELINE mode: Traditional per-value approach.
     """
-    from src.crypto.ckks_module import CKKSContext
-    from src.analytics.statistics import homomorphic_mean
+    ctx = shared_ctx(optimized)
     
-    ctx = CKKSContext()
-    if optimized:
-        ctx.create_optimized_context()
-    else:
-        ctx.create_context()
-    
-    n = len(values)
-    p_mean = np.mean(values)
+    n = values.size
+    p_mean = values.mean()
     
     if optimized:
         # TRUE SIMD: Pack values into slot-sized chunks (not timed)
-        encrypted_chunks = []
-        for i in range(0, n, SIMD_SLOTS):
-            chunk = values[i:i + SIMD_SLOTS]
-            chunk_len = len(chunk)
-            if chunk_len < SIMD_SLOTS:
-                chunk = chunk + [0.0] * (SIMD_SLOTS - chunk_len)
-            encrypted_chunks.append((ctx.encrypt_vector(chunk), chunk_len))
+        encrypted_chunks = ctx.parallel_encrypt(simd_chunks(values), max_workers=ENCRYPT_THREADS)
         
         # TIME ONLY HOMOMORPHIC OPERATIONS
         start = time.perf_counter()
         
         # Sum all encrypted chunks (O(n/8192) operations instead of O(n))
-        total_sum = None
-        for enc, _ in encrypted_chunks:
-            if total_sum is None:
-                total_sum = enc
-            else:
-                total_sum = total_sum + enc
+        total_sum = ctx.sum_encrypted(encrypted_chunks)
         
         # Decrypt and compute mean
         dec = ctx.decrypt_vector(total_sum)
@@ -299,14 +280,26 @@ def benchmark_ckks_mean(values: List[float], optimized: bool = False) -> Tuple[f
         elapsed = time.perf_counter() - start
         
     else:
-        # BASELINE: Individual encryption (not timed)
-        encrypted = [ctx.encrypt_vector([v]) for v in values]
+        # BASELINE: one ciphertext per value. 100K ciphertexts would not fit
+        # in memory at once, so values are encrypted a batch at a time (not
+        # timed) and each batch's add loop is timed as a whole, keeping timer
+        # calls out of the per-add cost
+        add_ns = 0
+        acc = None
+        for i in range(0, n, BASELINE_ADD_BATCH):
+            batch = [ctx.encrypt_vector([v]) for v in values[i:i + BASELINE_ADD_BATCH]]
+            if acc is None:
+                acc = batch.pop(0)
+            t0 = time.perf_counter_ns()
+            for enc in batch:
+                acc += enc
+            add_ns += time.perf_counter_ns() - t0
         
-        # TIME ONLY HOMOMORPHIC OPERATIONS
+        # TIME ONLY HOMOMORPHIC OPERATIONS (the adds above, plus scale and decrypt)
         start = time.perf_counter()
-        result = homomorphic_mean(encrypted)
+        result = acc * (1.0 / n)
         decrypted = ctx.decrypt_vector(result)
-        elapsed = time.perf_counter() - start
+        elapsed = time.perf_counter() - start + add_ns / 1e9
         
         # Extract decrypted value
         if isinstance(decrypted, list) and len(decrypted) > 0:
@@ -368,10 +361,21 @@ def run_benchmarks():
     
     overall_start = time.perf_counter()
     
+    # Untimed setup runs concurrently: the data files are parsed while both
+    # CKKS contexts generate their keys
+    with ThreadPoolExecutor() as pool:
+        contexts = [pool.submit(shared_ctx, optimized) for optimized in (False, True)]
+        loads = {count: pool.submit(load_field_values, available_files[count], BENCHMARK_FIELD, count)
+                 for count in record_counts}
+        for ctx_future in contexts:
+            ctx_future.result()  # re-raise any key generation error here
+    
+    # The timed benchmarks run one after another in this process, so each one
+    # has the cores (and the cached contexts) to itself
     for count in record_counts:
         filepath = available_files[count]
-        print(f"\n  📊 Loading {format_number(count)} records from {os.path.basename(filepath)}...")
-        values = load_field_values(filepath, BENCHMARK_FIELD, limit=count)
+        print(f"\n  📊 Loaded {format_number(count)} records from {os.path.basename(filepath)}")
+        values = loads[count].result()
         
         if len(values) < count:
             print(f"     ⚠ Only {len(values)} valid values found")
@@ -423,16 +427,16 @@ def run_benchmarks():
     with open(baseline_path, 'w', newline='') as f:
         writer = csv.writer(f)
         writer.writerow(KPI_COLUMNS)
-        for metric, count, seconds, mse, rmse, acc in baseline_results:
-            writer.writerow([metric, count, f"{seconds:.6f}", f"{mse:.2e}", f"{rmse:.2e}", f"{acc:.4f}"])
+        writer.writerows([metric, count, f"{seconds:.6f}", f"{mse:.2e}", f"{rmse:.2e}", f"{acc:.4f}"]
+                         for metric, count, seconds, mse, rmse, acc in baseline_results)
     print(f"  ✓ Saved: {baseline_path}")
     
     optimized_path = os.path.join(OUTPUT_DIR, "ckks_optimized_results.csv")
     with open(optimized_path, 'w', newline='') as f:
         writer = csv.writer(f)
         writer.writerow(KPI_COLUMNS)
-        for metric, count, seconds, mse, rmse, acc in optimized_results:
-            writer.writerow([metric, count, f"{seconds:.6f}", f"{mse:.2e}", f"{rmse:.2e}", f"{acc:.4f}"])
+        writer.writerows([metric, count, f"{seconds:.6f}", f"{mse:.2e}", f"{rmse:.2e}", f"{acc:.4f}"]
+                         for metric, count, seconds, mse, rmse, acc in optimized_results)
     print(f"  ✓ Saved: {optimized_path}")
     
     # Save key generation results to final_kpis.csv
@@ -445,9 +449,11 @@ def run_benchmarks():
             writer.writerow(["metric", "records", "seconds", "mse", "rmse", "accuracy_pct"])
         
         # Add key generation metrics (records=0 indicates N/A)
-        writer.writerow(["aes_key_generation", 0, f"{keygen_metrics['aes_key_gen_sec']:.6f}", "0", "0", "100"])
-        writer.writerow(["ckks_baseline_key_generation", 0, f"{keygen_metrics['ckks_baseline_key_gen_sec']:.6f}", "0", "0", "100"])
-        writer.writerow(["ckks_optimized_key_generation", 0, f"{keygen_metrics['ckks_optimized_key_gen_sec']:.6f}", "0", "0", "100"])
+        writer.writerows([
+            ["aes_key_generation", 0, f"{keygen_metrics['aes_key_gen_sec']:.6f}", "0", "0", "100"],
+            ["ckks_baseline_key_generation", 0, f"{keygen_metrics['ckks_baseline_key_gen_sec']:.6f}", "0", "0", "100"],
+            ["ckks_optimized_key_generation", 0, f"{keygen_metrics['ckks_optimized_key_gen_sec']:.6f}", "0", "0", "100"],
+        ])
     
     print(f"  ✓ Key generation metrics added to: {kpis_path}")
     
@@ -1,6 +1,7 @@
 import os
-import csv
-import random
+
+import numpy as np
+import pandas as pd
 
 
 def ensure_dir(path: str):
@@ -8,45 +9,41 @@ def ensure_dir(path: str):
 
 
 def generate_dataset(path: str, n: int):
-    headers = [
-        "patient_id",
-        "name",
-        "age",
-        "heart_rate",
-        "blood_pressure_sys",
-        "blood_pressure_dia",
-        "temperature",
-        "glucose",
-    ]
-
-    with open(path, "w", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(headers)
-        for i in range(1, n + 1):
-            patient_id = i
-            name = f"Patient {i}"
-            age = random.randint(18, 90)
-            heart_rate = random.randint(50, 110)
-            bp_sys = random.randint(90, 160)
-            bp_dia = random.randint(60, 100)
-            temperature = round(random.uniform(96.0, 103.0), 1)
-            glucose = round(random.uniform(70.0, 180.0), 1)
-            w.writerow([
-                patient_id,
-                name,
-                age,
-                heart_rate,
-                bp_sys,
-                bp_dia,
-                temperature,
-                glucose,
-            ])
+    # Each column is sampled in one NumPy call and the frame written in one
+    # to_csv pass; integer ranges are inclusive, as with random.randint
+    rng = np.random.default_rng()
+    ids = np.arange(1, n + 1)
+    df = pd.DataFrame({
+        "patient_id": ids,
+        "name": [f"Patient {i}" for i in ids],
+        "age": rng.integers(18, 91, size=n),
+        "heart_rate": rng.integers(50, 111, size=n),
+        "blood_pressure_sys": rng.integers(90, 161, size=n),
+        "blood_pressure_dia": rng.integers(60, 101, size=n),
+        "temperature": rng.uniform(96.0, 103.0, size=n).round(1),
+        "glucose": rng.uniform(70.0, 180.0, size=n).round(1),
+    })
+    with open(path, "w", newline="", buffering=1 << 20) as f:
+        df.to_csv(f, index=False, float_format="%.1f")
+    return df
+
+
+def write_parquet(df: pd.DataFrame, csv_path: str) -> bool:
+    """Write df as a zstd Parquet copy next to csv_path; skipped if no Parquet engine is installed."""
+    try:
+        df.to_parquet(os.path.splitext(csv_path)[0] + ".parquet", compression="zstd", index=False)
+    except ImportError:
+        return False
+    return True
 
 
 if __name__ == "__main__":
     base = os.path.join("data", "synthetic")
     ensure_dir(base)
-    generate_dataset(os.path.join(base, "patients_1k.csv"), 1000)
-    generate_dataset(os.path.join(base, "patients_10k.csv"), 10000)
-    generate_dataset(os.path.join(base, "patients_100k.csv"), 100000)
+    for name, n in (("patients_1k.csv", 1000), ("patients_10k.csv", 10000), ("patients_100k.csv", 100000)):
+        path = os.path.join(base, name)
+        df = generate_dataset(path, n)
+        # Columnar copy so benchmarks can read single fields without CSV parsing
+        if not write_parquet(df, path):
+            print(f"pyarrow not installed; skipped Parquet copy of {name}")
 
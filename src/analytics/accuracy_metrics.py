@@ -21,11 +21,13 @@ def calculate_mse(plaintext_result: List[float], decrypted_result: List[float])
         elif len(plaintext_result) != len(decrypted_result):
              raise ValueError(f"Length mismatch: {len(plaintext_result)} vs {len(decrypted_result)}")
 
-    # Ensure inputs are numpy arrays
-    p_arr = np.array(plaintext_result)
-    d_arr = np.array(decrypted_result)
+    # Ensure inputs are numpy arrays (no copy if callers already pass float64 arrays)
+    p_arr = np.asarray(plaintext_result, dtype=np.float64)
+    d_arr = np.asarray(decrypted_result, dtype=np.float64)
     
-    return np.mean((p_arr - d_arr) ** 2)
+    # Square the difference in place rather than allocating a second temporary
+    diff = np.subtract(p_arr, d_arr)
+    return np.square(diff, out=diff).mean()
 
 def calculate_rmse(plaintext_result: List[float], decrypted_result: List[float]) -> float:
     """
@@ -48,11 +50,11 @@ def calculate_accuracy_percentage(plaintext_result: List[float], decrypted_resul
     if len(plaintext_result) != len(decrypted_result):
         raise ValueError(f"Length mismatch: {len(plaintext_result)} vs {len(decrypted_result)}")
         
-    p_arr = np.array(plaintext_result)
-    d_arr = np.array(decrypted_result)
+    p_arr = np.asarray(plaintext_result, dtype=np.float64)
+    d_arr = np.asarray(decrypted_result, dtype=np.float64)
     
-    diff = np.abs(p_arr - d_arr)
-    matches = np.sum(diff <= tolerance)
+    diff = np.subtract(p_arr, d_arr)
+    matches = np.count_nonzero(np.abs(diff, out=diff) <= tolerance)
     
     if len(p_arr) == 0:
         return 0.0
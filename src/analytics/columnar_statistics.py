@@ -38,7 +38,8 @@ class ColumnarStatistics:
         Sum all slots in an encrypted CKKS vector homomorphically.
         
         Uses TenSEAL's native .sum() operation which performs slot-wise
-        summation without decryption.
+        summation without decryption via a rotate-and-add tree
+        (log2(slots) rotations, e.g. 13 for 8192 slots).
         
         Args:
             encrypted_vector: Encrypted CKKS vector containing data slots
@@ -189,13 +190,21 @@ class ColumnarStatistics:
             if not ciphertexts:
                 raise ValueError("ciphertexts list cannot be empty")
             
-            # Sum each chunk
-            chunk_sums = [chunk.sum() for chunk in ciphertexts]
-            
-            # Add all chunk sums together
-            total_sum = chunk_sums[0]
-            for chunk_sum in chunk_sums[1:]:
-                total_sum = total_sum + chunk_sum
+            if len({chunk.size() for chunk in ciphertexts}) == 1:
+                # Equal-size (padded) chunks: add slot-wise first (cheap, no
+                # key-switching), then collapse the slots once. TenSEAL's
+                # .sum() is a log2(slots) rotate-and-add, so this costs 13
+                # rotations for 8192 slots in total instead of 13 per chunk.
+                slot_totals = ciphertexts[0]
+                for chunk in ciphertexts[1:]:
+                    slot_totals = slot_totals + chunk
+                total_sum = slot_totals.sum()
+            else:
+                # Unpadded chunks of different sizes can't be added slot-wise
+                chunk_sums = [chunk.sum() for chunk in ciphertexts]
+                total_sum = chunk_sums[0]
+                for chunk_sum in chunk_sums[1:]:
+                    total_sum = total_sum + chunk_sum
             
             logger.debug(f"Computed multi-ciphertext sum across {len(ciphertexts)} chunks")
             return total_sum
@@ -35,6 +35,7 @@ AES-256-GCM satisfies all requirements while maintaining NIST compliance.
 from Crypto.Cipher import AES
 from Crypto.Random import get_random_bytes
 import base64
+from typing import List, Sequence
 
 
 class AESCipher:
@@ -63,6 +64,23 @@ class AESCipher:
         """
         return get_random_bytes(32)
 
+    @staticmethod
+    def generate_keys(count: int) -> List[bytes]:
+        """
+        Generate count independent 256-bit AES keys.
+        
+        Draws 32 * count bytes from the CSPRNG in a single call and splits
+        them into 32-byte keys, instead of one entropy request per key.
+        
+        Args:
+            count: Number of keys to generate
+            
+        Returns:
+            List of 32-byte AES-256 keys
+        """
+        pool = get_random_bytes(32 * count)
+        return [pool[i:i + 32] for i in range(0, 32 * count, 32)]
+
     @staticmethod
     def encrypt(plaintext: bytes, key: bytes) -> dict:
         """
@@ -153,3 +171,65 @@ class AESCipher:
         # Decrypt and verify authentication tag (atomically)
         # Raises ValueError if tag verification fails
         return cipher.decrypt_and_verify(ciphertext, tag)
+
+    @staticmethod
+    def encrypt_many(plaintexts: Sequence[bytes], key: bytes) -> List[dict]:
+        """
+        Encrypt a batch of records with AES-256-GCM.
+        
+        Output is identical in form to calling encrypt() per record: every
+        record still gets its own unique nonce and authentication tag, so
+        payloads can be decrypted individually with decrypt(). The batch path
+        draws all nonces from the CSPRNG in one call and keeps the cipher
+        constructor and base64 encoder bound locally, removing the per-call
+        overhead that dominates short PII fields.
+        
+        Args:
+            plaintexts: Raw bytes for each record
+            key: 32-byte AES-256 key
+            
+        Returns:
+            List of payload dictionaries (see encrypt()), in input order
+        """
+        nonces = get_random_bytes(12 * len(plaintexts))
+        new_cipher = AES.new
+        b64encode = base64.b64encode
+        payloads = []
+        for i, plaintext in enumerate(plaintexts):
+            nonce = nonces[12 * i:12 * i + 12]
+            ciphertext, tag = new_cipher(key, AES.MODE_GCM, nonce=nonce).encrypt_and_digest(plaintext)
+            payloads.append({
+                "nonce": b64encode(nonce).decode("ascii"),
+                "ciphertext": b64encode(ciphertext).decode("ascii"),
+                "tag": b64encode(tag).decode("ascii"),
+            })
+        return payloads
+
+    @staticmethod
+    def decrypt_many(payloads: Sequence[dict], key: bytes) -> List[bytes]:
+        """
+        Decrypt a batch of payloads produced by encrypt() or encrypt_many().
+        
+        Each payload's tag is verified exactly as in decrypt(); the batch
+        path only hoists the cipher constructor and base64 decoder out of
+        the per-record call.
+        
+        Args:
+            payloads: Dictionaries with base64-encoded 'nonce', 'ciphertext', and 'tag'
+            key: 32-byte AES-256 key (must match encryption key)
+            
+        Returns:
+            Decrypted plaintext bytes for each payload, in input order
+            
+        Raises:
+            ValueError: If any authentication tag verification fails
+            KeyError: If a payload is missing required fields
+        """
+        new_cipher = AES.new
+        b64decode = base64.b64decode
+        return [
+            new_cipher(key, AES.MODE_GCM, nonce=b64decode(p["nonce"])).decrypt_and_verify(
+                b64decode(p["ciphertext"]), b64decode(p["tag"])
+            )
+            for p in payloads
+        ]
@@ -1,11 +1,76 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import FrozenSet, List, Optional
+
 import tenseal as ts
-from typing import List
+
+
+@lru_cache(maxsize=None)
+def _seal_linked_with_hexl() -> bool:
+    # Heuristic, cached per process: TenSEAL does not expose SEAL's build
+    # flags, but a SEAL_USE_INTEL_HEXL build statically links Intel HEXL, whose
+    # (mangled) symbols end up in the module. Any other b"hexl" byte run in
+    # the binary would also match, so treat a "yes" as likely, not certain
+    try:
+        import _tenseal_cpp
+        with open(_tenseal_cpp.__file__, "rb") as f:
+            return b"hexl" in f.read()
+    except (ImportError, OSError, AttributeError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def _cpu_flags() -> FrozenSet[str]:
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return frozenset(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return frozenset()
+
+
+_worker_context = None
+
+
+def _init_encrypt_worker(public_context: bytes):
+    global _worker_context
+    _worker_context = ts.context_from(public_context)
+
+
+def _encrypt_serialized(plaintext_vector: List[float]) -> bytes:
+    return ts.ckks_vector(_worker_context, plaintext_vector).serialize()
 
 
 class CKKSContext:
     def __init__(self):
         self.context = None
 
+    @property
+    def has_hexl(self) -> bool:
+        return _seal_linked_with_hexl()
+
+    @property
+    def has_avx512(self) -> bool:
+        return "avx512f" in _cpu_flags()
+
+    def backend_info(self) -> str:
+        # HEXL is inferred by scanning the TenSEAL binary (see
+        # _seal_linked_with_hexl), so it is labelled as a heuristic
+        ifma = "avx512ifma" in _cpu_flags()
+        return (f"HEXL={'yes' if self.has_hexl else 'no'} (heuristic) "
+                f"avx512={'yes' if self.has_avx512 else 'no'} "
+                f"avx512ifma={'yes' if ifma else 'no'}")
+
+    def warn_if_hexl_missing(self) -> bool:
+        if self.has_avx512 and not self.has_hexl:
+            print("  WARN: CPU has AVX-512 but SEAL appears to be built without Intel HEXL; "
+                  "rebuild SEAL/TenSEAL with SEAL_USE_INTEL_HEXL=ON for ~1.5x faster CKKS ops")
+            return True
+        return False
+
     def create_context(self, poly_degree: int = 8192):
         self.context = ts.context(
             ts.SCHEME_TYPE.CKKS,
@@ -35,6 +100,19 @@ class CKKSContext:
         self.context.generate_relin_keys()
         return self.context
 
+    def create_storage_context(self, poly_degree: int = 8192, scale_bits: int = 40):
+        # Encrypt-only parameters (multiplicative depth 0): one 60-bit data
+        # prime holds the scale (40 bits by default), plus the special prime.
+        # No Galois or relinearization keys, since nothing is rotated or
+        # multiplied.
+        self.context = ts.context(
+            ts.SCHEME_TYPE.CKKS,
+            poly_modulus_degree=poly_degree,
+            coeff_mod_bit_sizes=[60, 50],
+        )
+        self.context.global_scale = 2 ** scale_bits
+        return self.context
+
     def serialize_context(self, save_secret_key: bool = True) -> bytes:
         if self.context is None:
             raise RuntimeError("Context not created")
@@ -58,6 +136,63 @@ class CKKSContext:
             flat.extend(v)
         return ts.ckks_vector(self.context, flat)
 
+    def parallel_encrypt(self, list_of_vectors: List[List[float]], max_workers: Optional[int] = None):
+        if self.context is None:
+            raise RuntimeError("Context not created")
+        # SEAL encrypts in native code; threads share this context and keys
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+            return list(ex.map(self.encrypt_vector, list_of_vectors))
+
+    def encrypt_pool(self, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+        if self.context is None:
+            raise RuntimeError("Context not created")
+        workers = max_workers or os.cpu_count() or 1
+        # Workers only encrypt, so they get the public key without the secret,
+        # Galois or relinearization keys; ciphertexts come back serialized
+        public_context = self.context.serialize(
+            save_public_key=True,
+            save_secret_key=False,
+            save_galois_keys=False,
+            save_relin_keys=False,
+        )
+        ex = ProcessPoolExecutor(max_workers=workers, initializer=_init_encrypt_worker,
+                                 initargs=(public_context,))
+        # Workers start lazily; one throwaway encryption each spawns them and
+        # loads their context now, so callers can keep that out of timed regions
+        for future in [ex.submit(_encrypt_serialized, [0.0]) for _ in range(workers)]:
+            future.result()
+        return ex
+
+    def process_encrypt(self, list_of_vectors: List[List[float]], max_workers: Optional[int] = None,
+                        executor: Optional[ProcessPoolExecutor] = None):
+        if self.context is None:
+            raise RuntimeError("Context not created")
+        if executor is not None:
+            # Caller-owned pool from encrypt_pool(); left running for reuse
+            blobs = list(executor.map(_encrypt_serialized, list_of_vectors))
+            return [ts.ckks_vector_from(self.context, blob) for blob in blobs]
+        workers = min(max_workers or os.cpu_count() or 1, len(list_of_vectors))
+        if workers <= 1:
+            return [self.encrypt_vector(v) for v in list_of_vectors]
+        with self.encrypt_pool(workers) as ex:
+            return self.process_encrypt(list_of_vectors, executor=ex)
+
+    def encrypt_sum(self, list_of_vectors: List[List[float]]):
+        if self.context is None:
+            raise RuntimeError("Context not created")
+        # Fold each chunk into the running sum as soon as it is encrypted, so
+        # only the accumulator and the current chunk are ever alive
+        acc = None
+        for vec in list_of_vectors:
+            enc = self.encrypt_vector(vec)
+            if acc is None:
+                acc = enc
+            else:
+                acc += enc
+        if acc is None:
+            raise ValueError("list_of_vectors cannot be empty")
+        return acc
+
     @staticmethod
     def decrypt_vector(ciphertext):
         return ciphertext.decrypt()
@@ -75,6 +210,20 @@ class CKKSContext:
         res = enc_a + enc_b
         return res
 
+    @staticmethod
+    def sum_encrypted(ciphertexts: List):
+        # Sequential in-place adds into a fresh accumulator; inputs are not
+        # modified. A threaded pairwise reduction was slower at every chunk
+        # count the benchmarks use (at most 13 at 100K records), so there is none
+        if not ciphertexts:
+            raise ValueError("ciphertexts list cannot be empty")
+        if len(ciphertexts) == 1:
+            return ciphertexts[0]
+        acc = ciphertexts[0] + ciphertexts[1]
+        for enc in ciphertexts[2:]:
+            acc += enc
+        return acc
+
     @staticmethod
     def multiply_encrypted(enc_a, enc_b):
         res = enc_a * enc_b
@@ -92,6 +241,9 @@ class CKKSContext:
             plain_modulus=plain_modulus,
         )
         self.bfv_plain_modulus = plain_modulus
+        # plain_modulus is prime and 1 mod 2*poly_degree, so batching packs
+        # one integer per coefficient slot
+        self.bfv_slot_count = poly_degree
         return self.context
 
     def bfv_encrypt(self, ints: List[int]):
@@ -19,6 +19,7 @@ import os
 import base64
 import logging
 from typing import Dict, List, Any, Tuple
+import numpy as np
 import tenseal as ts
 
 from src.crypto.data_classifier import DataClassifier
@@ -127,6 +128,9 @@ class ColumnarEncryptor:
         """
         encrypted_columns = {}
         actual_counts = {}
+        # Shared zero-initialised slot buffer for short chunks; SEAL copies the
+        # values on encode, so one buffer can be refilled for every column
+        padded = np.zeros(self.simd_slot_count, dtype=np.float64)
         
         for field_name, values in columns.items():
             actual_count = len(values)
@@ -136,8 +140,9 @@ class ColumnarEncryptor:
             if actual_count <= self.simd_slot_count:
                 # Single ciphertext can hold all values
                 # Pad to SIMD slot count for consistent processing
-                padded_values = values + [0.0] * (self.simd_slot_count - actual_count)
-                encrypted_vector = self.ckks.encrypt_vector(padded_values)
+                padded[:actual_count] = values
+                padded[actual_count:] = 0.0
+                encrypted_vector = self.ckks.encrypt_vector(padded)
                 
                 encrypted_columns[field_name] = {
                     'ciphertext': encrypted_vector,
@@ -150,15 +155,19 @@ class ColumnarEncryptor:
                 # Need multiple ciphertexts
                 chunks = []
                 num_chunks = (actual_count + self.simd_slot_count - 1) // self.simd_slot_count
+                # Full chunks are float64 views handed straight to the binding
+                arr = np.asarray(values, dtype=np.float64)
                 
                 for i in range(num_chunks):
                     start_idx = i * self.simd_slot_count
                     end_idx = min(start_idx + self.simd_slot_count, actual_count)
-                    chunk_values = values[start_idx:end_idx]
+                    chunk_values = arr[start_idx:end_idx]
                     
                     # Pad the last chunk if needed
-                    if len(chunk_values) < self.simd_slot_count:
-                        chunk_values = chunk_values + [0.0] * (self.simd_slot_count - len(chunk_values))
+                    if chunk_values.size < self.simd_slot_count:
+                        padded[:chunk_values.size] = chunk_values
+                        padded[chunk_values.size:] = 0.0
+                        chunk_values = padded
                     
                     encrypted_chunk = self.ckks.encrypt_vector(chunk_values)
                     chunks.append(encrypted_chunk)
@@ -11,6 +11,7 @@ Security Rationale:
 - Vitals require computation on encrypted data (CKKS homomorphic encryption)
 """
 
+from functools import lru_cache
 from typing import Dict, Any, Tuple, List
 import pandas as pd
 
@@ -155,26 +156,15 @@ class DataClassifier:
             >>> report['vitals_count']
             1
         """
-        field_classifications = {}
-        pii_count = 0
-        vitals_count = 0
-        unknown_count = 0
-        
-        for column in dataset.columns:
-            category = DataClassifier.classify_field(column)
-            field_classifications[column] = category
-            
-            if category == 'PII':
-                pii_count += 1
-            elif category == 'SENSITIVE_VITALS':
-                vitals_count += 1
-            else:
-                unknown_count += 1
+        # Classification depends only on the column names, so it is cached per
+        # schema; the report dict itself is rebuilt so callers can't share state
+        classifications, pii_count, vitals_count, unknown_count = \
+            DataClassifier._classify_columns(tuple(dataset.columns))
         
         total_fields = len(dataset.columns)
         
         return {
-            'field_classifications': field_classifications,
+            'field_classifications': dict(classifications),
             'pii_count': pii_count,
             'vitals_count': vitals_count,
             'unknown_count': unknown_count,
@@ -184,6 +174,21 @@ class DataClassifier:
             'dataset_rows': len(dataset)
         }
     
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _classify_columns(columns: Tuple[str, ...]) -> Tuple[Tuple[Tuple[str, str], ...], int, int, int]:
+        """
+        Classify a tuple of column names.
+        
+        Returns:
+            Tuple of ((column, category) pairs, pii_count, vitals_count, unknown_count)
+        """
+        classifications = tuple((column, DataClassifier.classify_field(column)) for column in columns)
+        categories = [category for _, category in classifications]
+        pii_count = categories.count('PII')
+        vitals_count = categories.count('SENSITIVE_VITALS')
+        return classifications, pii_count, vitals_count, len(categories) - pii_count - vitals_count
+    
     @staticmethod
     def print_classification_summary(report: Dict[str, Any]) -> None:
         """
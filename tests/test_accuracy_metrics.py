@@ -181,6 +181,19 @@ class TestEdgeCases:
         # Accuracy percentage should return 0 for empty arrays
         accuracy = calculate_accuracy_percentage(plaintext, decrypted)
         assert accuracy == 0.0, "Accuracy of empty arrays should be 0"
+    
+    def test_numpy_array_inputs(self):
+        """Test metrics accept NumPy arrays and match the list-based results."""
+        plaintext = np.array([1.0, 2.0, 3.0, 4.0])
+        decrypted = np.array([1.1, 2.0, 2.9, 4.5])
+        
+        assert calculate_mse(plaintext, decrypted) == pytest.approx(
+            calculate_mse(plaintext.tolist(), decrypted.tolist()))
+        assert calculate_mse(plaintext, decrypted) == pytest.approx((0.01 + 0.0 + 0.01 + 0.25) / 4)
+        assert calculate_accuracy_percentage(plaintext, decrypted, tolerance=0.2) == 75.0
+        # Inputs must not be modified by the in-place arithmetic
+        np.testing.assert_array_equal(plaintext, [1.0, 2.0, 3.0, 4.0])
+        np.testing.assert_array_equal(decrypted, [1.1, 2.0, 2.9, 4.5])
 
 
 class TestCKKSAccuracy:
@@ -12,6 +12,14 @@ def test_key_generation():
     assert len(key) == 32
 
 
+def test_generate_keys():
+    keys = AESCipher.generate_keys(4)
+    assert len(keys) == 4
+    assert all(isinstance(k, bytes) and len(k) == 32 for k in keys)
+    assert len(set(keys)) == 4
+    assert AESCipher.generate_keys(0) == []
+
+
 def test_encrypt_decrypt():
     key = AESCipher.generate_key()
     payload = AESCipher.encrypt(b"hello world", key)
@@ -33,3 +41,15 @@ def test_invalid_key():
     key_bad = AESCipher.generate_key()
     with pytest.raises(ValueError):
         AESCipher.decrypt(payload, key_bad)
+
+
+def test_encrypt_many_decrypt_many():
+    key = AESCipher.generate_key()
+    plaintexts = [f"record-{i}".encode() for i in range(5)] + [b"same", b"same"]
+    payloads = AESCipher.encrypt_many(plaintexts, key)
+    assert len({p["nonce"] for p in payloads}) == len(plaintexts)
+    assert AESCipher.decrypt_many(payloads, key) == plaintexts
+    # Batch payloads remain individually decryptable
+    assert AESCipher.decrypt(payloads[3], key) == plaintexts[3]
+    with pytest.raises(ValueError):
+        AESCipher.decrypt_many(payloads, AESCipher.generate_key())
@@ -163,6 +163,18 @@ class TestDataSegmentation:
         assert report["unknown_count"] == 1, "Should identify 1 unknown field"
         assert report["total_fields"] == 5, "Should have 5 total fields"
         assert report["dataset_rows"] == 2, "Should have 2 rows"
+    
+    def test_classification_report_cached_per_schema(self):
+        """Same columns reuse the cached classification but get an independent report."""
+        df_small = pd.DataFrame({"patient_id": ["P001"], "heart_rate": [72]})
+        df_large = pd.DataFrame({"patient_id": ["P001", "P002", "P003"], "heart_rate": [72, 75, 80]})
+        
+        first = DataClassifier.get_classification_report(df_small)
+        first["field_classifications"]["heart_rate"] = "TAMPERED"
+        second = DataClassifier.get_classification_report(df_large)
+        
+        assert second["field_classifications"] == {"patient_id": "PII", "heart_rate": "SENSITIVE_VITALS"}
+        assert second["dataset_rows"] == 3
 
 
 class TestHybridEncryptionRouting:
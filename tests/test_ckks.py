@@ -41,3 +41,75 @@ def test_homomorphic_multiplication():
     dec = mgr.decrypt_vector(c)
     assert np.allclose(dec, [8.0], atol=1e-2)
 
+
+def test_parallel_encrypt_preserves_order():
+    mgr = CKKSContext()
+    mgr.create_context()
+    vecs = [[float(i), float(i) * 2.0] for i in range(8)]
+    encs = mgr.parallel_encrypt(vecs, max_workers=4)
+    assert len(encs) == len(vecs)
+    for enc, vec in zip(encs, vecs):
+        assert np.allclose(mgr.decrypt_vector(enc), vec, atol=1e-2)
+
+
+def test_backend_info_reports_flags():
+    mgr = CKKSContext()
+    assert isinstance(mgr.has_hexl, bool)
+    assert isinstance(mgr.has_avx512, bool)
+    info = mgr.backend_info()
+    assert f"HEXL={'yes' if mgr.has_hexl else 'no'}" in info
+    assert f"avx512={'yes' if mgr.has_avx512 else 'no'}" in info
+    assert mgr.warn_if_hexl_missing() == (mgr.has_avx512 and not mgr.has_hexl)
+
+
+def test_process_encrypt_decrypts_with_owner_context():
+    mgr = CKKSContext()
+    mgr.create_context()
+    vecs = [[float(i), float(i) + 0.5] for i in range(3)]
+    encs = mgr.process_encrypt(vecs, max_workers=2)
+    assert len(encs) == len(vecs)
+    for enc, vec in zip(encs, vecs):
+        assert np.allclose(mgr.decrypt_vector(enc), vec, atol=1e-2)
+
+
+def test_process_encrypt_reuses_caller_pool():
+    mgr = CKKSContext()
+    mgr.create_context()
+    with mgr.encrypt_pool(max_workers=2) as pool:
+        for start in (0.0, 10.0):
+            vecs = [[start + i] for i in range(3)]
+            encs = mgr.process_encrypt(vecs, executor=pool)
+            for enc, vec in zip(encs, vecs):
+                assert np.allclose(mgr.decrypt_vector(enc), vec, atol=1e-2)
+
+
+def test_sum_encrypted_matches_plain_sum():
+    mgr = CKKSContext()
+    mgr.create_context()
+    vecs = [[float(i), 1.0] for i in range(5)]
+    encs = [mgr.encrypt_vector(v) for v in vecs]
+    dec = mgr.decrypt_vector(mgr.sum_encrypted(encs))
+    assert np.allclose(dec, [10.0, 5.0], atol=1e-2)
+    assert np.allclose(mgr.decrypt_vector(encs[0]), vecs[0], atol=1e-2)
+    assert mgr.sum_encrypted(encs[:1]) is encs[0]
+
+
+def test_encrypt_sum_streams_chunks():
+    mgr = CKKSContext()
+    mgr.create_context()
+    vecs = [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+    dec = mgr.decrypt_vector(mgr.encrypt_sum(vecs))
+    assert np.allclose(dec, [9.0, 12.0], atol=1e-2)
+    with pytest.raises(ValueError):
+        mgr.encrypt_sum([])
+
+
+def test_storage_context_is_smaller_and_accurate():
+    storage = CKKSContext()
+    storage.create_storage_context()
+    analytics = CKKSContext()
+    analytics.create_optimized_context()
+    vec = [98.6, 120.0, 80.0]
+    enc = storage.encrypt_vector(vec)
+    assert np.allclose(storage.decrypt_vector(enc), vec, atol=1e-3)
+    assert len(enc.serialize()) < len(analytics.encrypt_vector(vec).serialize()) / 4
@@ -153,6 +153,57 @@ class TestColumnarStatistics:
         
         assert abs(result - expected_mean) < 0.1, f"Expected {expected_mean}, got {result}"
     
+    def test_multi_ciphertext_sum_padded_chunks(self, context):
+        """Test padded equal-size chunks (ColumnarEncryptor layout) sum correctly"""
+        slots = 8192
+        chunk1_values = [float(i % 100) for i in range(slots)]
+        chunk2_values = [float(i % 100) for i in range(1808)]
+        padded2 = chunk2_values + [0.0] * (slots - len(chunk2_values))
+        
+        enc_chunks = [ts.ckks_vector(context, chunk1_values), ts.ckks_vector(context, padded2)]
+        
+        result_enc = ColumnarStatistics.handle_multi_ciphertext_sum(
+            enc_chunks,
+            [len(chunk1_values), len(chunk2_values)]
+        )
+        
+        expected_sum = sum(chunk1_values) + sum(chunk2_values)
+        result = result_enc.decrypt()[0]
+        
+        assert abs(result - expected_sum) < 1.0, f"Expected {expected_sum}, got {result}"
+
+    def test_multi_ciphertext_mean_padded_chunks(self, context):
+        """Test mean across three padded chunks matches the plaintext mean"""
+        slots = 8192
+        counts = [slots, slots, 1000]
+        chunks = [[60.0 + (i % 50) for i in range(n)] for n in counts]
+
+        enc_chunks = [ts.ckks_vector(context, chunk + [0.0] * (slots - len(chunk))) for chunk in chunks]
+
+        result_enc = ColumnarStatistics.handle_multi_ciphertext_mean(enc_chunks, counts)
+
+        expected_mean = sum(sum(chunk) for chunk in chunks) / sum(counts)
+        result = result_enc.decrypt()[0]
+
+        assert abs(result - expected_mean) < 0.01, f"Expected {expected_mean}, got {result}"
+
+    def test_multi_ciphertext_sum_unequal_chunks(self, context):
+        """Test unpadded chunks of different sizes fall back to per-chunk sums"""
+        chunk1_values = [float(i) for i in range(1, 101)]  # [1..100]
+        chunk2_values = [float(i) for i in range(101, 151)]  # [101..150]
+
+        enc_chunks = [ts.ckks_vector(context, chunk1_values), ts.ckks_vector(context, chunk2_values)]
+
+        result_enc = ColumnarStatistics.handle_multi_ciphertext_sum(
+            enc_chunks,
+            [len(chunk1_values), len(chunk2_values)]
+        )
+
+        expected_sum = sum(chunk1_values) + sum(chunk2_values)
+        result = result_enc.decrypt()[0]
+
+        assert abs(result - expected_sum) < 1.0, f"Expected {expected_sum}, got {result}"
+
     def test_healthcare_realistic_data(self, context):
         """Test with realistic healthcare data ranges"""
         # Simulate heart rate measurements